@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from ..utils.stats import percentile, summarise
+
+# Benchmark name and the module, relative to this package, providing main(argv)
+BENCHMARKS = {
+    'codec': '.codec',
+    'detection': '.detection',
+    'imports': '.imports',
+    'moves': '.moves',
+    'replay': '.replay',
+    'update': '.update',
+}
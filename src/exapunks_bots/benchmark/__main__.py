@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+import importlib
+import sys
+
+from . import BENCHMARKS
+
+
+def main(argv: list = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in BENCHMARKS:
+        print(f"usage: python -m exapunks_bots.benchmark {{{','.join(BENCHMARKS)}}} [args]")
+        sys.exit(2)
+    importlib.import_module(BENCHMARKS[argv[0]], __package__).main(argv[1:])
+
+
+if __name__ == '__main__':
+    main()
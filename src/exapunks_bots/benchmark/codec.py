@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import argparse
+import pickle
+import random
+import time
+
+from ..utils import BoundingBox, BoundingBox2, Point, codec
+from ..utils.stats import summarise
+
+
+def makeGraph(size: int, seed: int = 0) -> dict:
+    """
+    Create an object graph of frame detections, similar to saved
+    artifacts, holding the package's geometry types.
+
+    :param size: Number of bounding boxes per collection, should be an int
+    :param seed: Seed of the random coordinates, should be an int
+    :return: graph - dict
+    """
+    rng = random.Random(seed)
+
+    def box(cls):
+        x, y = rng.randint(0, 1900), rng.randint(0, 1060)
+        return cls(x, y, x + rng.randint(1, 120), y + rng.randint(1, 160))
+
+    return {'boxes': [box(BoundingBox) for _ in range(size)],
+            'candidates': [box(BoundingBox2) for _ in range(size)],
+            'points': [Point(rng.random() * 1920, rng.random() * 1080) for _ in range(size)],
+            'frames': [{'index': i, 'board': box(BoundingBox), 'labels': [f'card_{j}' for j in range(36)]}
+                       for i in range(max(1, size // 100))]}
+
+
+def timeIt(func, repeat: int) -> list:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main(argv: list = None) -> dict:
+    parser = argparse.ArgumentParser(prog='codec', description="Compare the binary codec against pickle")
+    parser.add_argument('--size', type=int, default=10000, help="number of bounding boxes per collection")
+    parser.add_argument('--repeat', type=int, default=10, help="number of timed runs")
+    args = parser.parse_args(argv)
+
+    graph = makeGraph(args.size)
+    encoded = {'codec': codec.dumps(graph), 'pickle': pickle.dumps(graph, pickle.HIGHEST_PROTOCOL)}
+    results = {
+        'codec': {'encode': summarise(timeIt(lambda: codec.dumps(graph), args.repeat)),
+                  'decode': summarise(timeIt(lambda: codec.loads(encoded['codec']), args.repeat)),
+                  'bytes': len(encoded['codec'])},
+        'pickle': {'encode': summarise(timeIt(lambda: pickle.dumps(graph, pickle.HIGHEST_PROTOCOL), args.repeat)),
+                   'decode': summarise(timeIt(lambda: pickle.loads(encoded['pickle']), args.repeat)),
+                   'bytes': len(encoded['pickle'])},
+    }
+    for name, result in results.items():
+        print(f"{name}: encode p50 {result['encode']['p50'] * 1e3:.2f} ms, "
+              f"decode p50 {result['decode']['p50'] * 1e3:.2f} ms, {result['bytes']} bytes")
+    return results
+
+
+if __name__ == '__main__':
+    main()
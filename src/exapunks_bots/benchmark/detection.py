@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import argparse
+import os
+
+from ..utils import utils
+from ..vision.detection import CardDetector
+from ..vision.synthetic import SyntheticLayout
+from .replay import ReplayHarness
+
+
+def main(argv: list = None) -> dict:
+    parser = argparse.ArgumentParser(prog='detection', description="Compare the accuracy and latency of full "
+                                                                   "resolution and coarse-to-fine card detection")
+    parser.add_argument('frames_dir', help="directory of recorded or synthetic frames and annotations")
+    parser.add_argument('--size', type=int, nargs=2, default=(960, 540), metavar=('WIDTH', 'HEIGHT'),
+                        help="size of the frames")
+    parser.add_argument('--factor', type=int, default=4, help="downscale factor of the coarse-to-fine path")
+    parser.add_argument('--templates', help="directory of card templates, rendered for the frame size if None")
+    parser.add_argument('--threshold', type=float, default=0.9, help="minimum decimal overlap of a detection")
+    parser.add_argument('--limit', type=int, help="maximum number of frames per pass")
+    parser.add_argument('--repeat', type=int, default=1, help="number of passes over the frames")
+    parser.add_argument('--output', help="save the results to this '.json' file")
+    args = parser.parse_args(argv)
+
+    detector = CardDetector.fromLayout(SyntheticLayout(*args.size), args.templates, factor=args.factor)
+    results = {}
+    for name, stage in (('full', detector.detect), ('coarse', detector.detectCoarse)):
+        harness = ReplayHarness(args.frames_dir, [(name, stage)], threshold=args.threshold)
+        result = harness.run(limit=args.limit, repeat=args.repeat)
+        print(result)
+        results[name] = result.toJson()
+
+    full, coarse = results['full']['stages']['full'], results['coarse']['stages']['coarse']
+    print(f"Coarse-to-fine speedup: {full['p50'] / coarse['p50']:.2f}x (p50)")
+    if args.output:
+        utils.save(*os.path.split(os.path.abspath(args.output)), results)
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from ..utils.stats import summarise
+
+MODULES = ('exapunks_bots.utils',)
+
+# Optional dependencies that should only be imported on first use
+HEAVY_MODULES = ('cv2', 'numpy', 'pyautogui', 'pygetwindow', 'shapely')
+
+_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps([elapsed, [name for name in {heavy!r} if name in sys.modules]]))
+"""
+
+
+def measureImport(module: str, env: dict = None) -> tuple:
+    """
+    Measure the import time of a module within a fresh interpreter.
+
+    :param module: Name of module to be imported, should be a str
+    :param env: Environment variables of the interpreter, should be a dict[str: str]
+    :return: elapsed, heavy_modules - tuple[float, list[str]]
+    """
+    output = subprocess.run([sys.executable, '-c', _SNIPPET.format(module=module, heavy=HEAVY_MODULES)],
+                            capture_output=True, text=True, check=True, env=env).stdout
+    elapsed, heavy_modules = json.loads(output)
+    return elapsed, heavy_modules
+
+
+def main(argv: list = None) -> dict:
+    parser = argparse.ArgumentParser(prog='imports', description="Measure package startup cost")
+    parser.add_argument('modules', nargs='*', default=MODULES, help="modules to be imported")
+    parser.add_argument('--repeat', type=int, default=10, help="number of fresh interpreters per module")
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ)
+    src_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [src_dir, env.get('PYTHONPATH')]))
+
+    results = {}
+    for module in args.modules:
+        times, heavy_modules = [], []
+        for _ in range(args.repeat):
+            elapsed, heavy_modules = measureImport(module, env=env)
+            times.append(elapsed)
+        results[module] = {'time': summarise(times), 'heavy_modules': heavy_modules}
+        print(f"{module}: mean {results[module]['time']['mean'] * 1e3:.2f} ms, "
+              f"p50 {results[module]['time']['p50'] * 1e3:.2f} ms, heavy modules loaded: {heavy_modules or 'none'}")
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import argparse
+import random
+
+from ..solitaire import cards, tables
+from ..solitaire.state import FREE_CELL, GameState, Move
+from ..utils.stats import summarise
+from .codec import timeIt
+
+
+def pairwiseRunLength(column: tuple) -> int:
+    """Reference runLength checking the rules of each pair of cards"""
+    length = 1 if column else 0
+    for i in range(len(column) - 1, 0, -1):
+        if not cards.canStack(column[i], column[i - 1]):
+            break
+        length += 1
+    return length
+
+
+def pairwiseMoves(state: GameState) -> list:
+    """Reference move generation checking the rules of each pair of cards"""
+    moves = []
+    tops = [column[-1] if column else None for column in state.columns]
+    for source, column in enumerate(state.columns):
+        if state.collapsed[source] or not column:
+            continue
+        for count in range(1, pairwiseRunLength(column) + 1):
+            bottom = column[-count]
+            for target, top in enumerate(tops):
+                if target == source or state.collapsed[target]:
+                    continue
+                if top is None:
+                    if count < len(column):
+                        moves.append(Move(source, target, count))
+                elif cards.canStack(bottom, top):
+                    moves.append(Move(source, target, count))
+        if state.free_cell is None:
+            moves.append(Move(source, FREE_CELL, 1))
+
+    if state.free_cell is not None:
+        for target, top in enumerate(tops):
+            if not state.collapsed[target] and (top is None or cards.canStack(state.free_cell, top)):
+                moves.append(Move(FREE_CELL, target, 1))
+    return moves
+
+
+def randomStates(size: int, seed: int = 0, max_moves: int = 30) -> list:
+    """Deal shuffled decks and play up to max_moves random legal moves"""
+    rng, states = random.Random(seed), []
+    for _ in range(size):
+        deck = list(cards.DECK)
+        rng.shuffle(deck)
+        state = GameState.deal(deck)
+        for _ in range(rng.randint(0, max_moves)):
+            moves = state.moves()
+            if not moves:
+                break
+            state = state.apply(rng.choice(moves))
+        states.append(state)
+    return states
+
+
+def main(argv: list = None) -> dict:
+    parser = argparse.ArgumentParser(prog='moves', description="Compare move-legality tables against pairwise "
+                                                               "rule checks")
+    parser.add_argument('--size', type=int, default=2000, help="number of random states")
+    parser.add_argument('--repeat', type=int, default=10, help="number of timed runs")
+    args = parser.parse_args(argv)
+
+    states = randomStates(args.size)
+    if any(state.moves() != pairwiseMoves(state) for state in states):
+        raise AssertionError("Table and pairwise move generation disagree")
+    pairs = [(card, onto) for card in cards.DECK for onto in cards.DECK]
+    columns = [column for state in states for column in state.columns]
+
+    runs = {
+        'canStack': (len(pairs), lambda: [cards.canStack(card, onto) for card, onto in pairs],
+                     lambda: [tables.canStack(card, onto) for card, onto in pairs]),
+        'runLength': (len(columns), lambda: [pairwiseRunLength(column) for column in columns],
+                      lambda: [tables.runLength(column) for column in columns]),
+        'moves': (len(states), lambda: [pairwiseMoves(state) for state in states],
+                  lambda: [state.moves() for state in states]),
+    }
+
+    results = {}
+    for name, (size, pairwise, table) in runs.items():
+        results[name] = {'pairwise': summarise(timeIt(pairwise, args.repeat)),
+                         'table': summarise(timeIt(table, args.repeat))}
+        pairwise_rate, table_rate = (size / results[name][path]['p50'] for path in ('pairwise', 'table'))
+        print(f"{name}: pairwise {pairwise_rate:,.0f}/s, table {table_rate:,.0f}/s "
+              f"({table_rate / pairwise_rate:.2f}x)")
+    return results
+
+
+if __name__ == '__main__':
+    main()
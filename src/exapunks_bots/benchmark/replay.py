@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import argparse
+import importlib
+import logging
+import os
+import time
+from typing import Any, Callable
+
+import numpy as np
+
+from ..utils import BoundingBox, box_array, utils
+from ..utils.stats import summarise
+
+_logger = logging.getLogger(__name__)
+
+FRAME_EXTS = ('npy', 'pkl', 'exb')
+
+
+class ReplayResult(object):
+    def __init__(self, stage_names: list | tuple):
+        self.frames = 0
+        self.load_time = 0.
+        self.process_time = 0.
+        self.stage_times = {name: [] for name in stage_names}
+        self.true_positives = 0
+        self.false_positives = 0
+        self.false_negatives = 0
+        self.label_matches = 0
+        self.annotated_frames = 0
+
+    @property
+    def fps(self) -> float:
+        """Frames processed per second, excluding frame loading"""
+        return self.frames / self.process_time if self.process_time else 0.
+
+    @property
+    def wall_fps(self) -> float:
+        """Frames processed per second, including frame loading"""
+        total_time = self.process_time + self.load_time
+        return self.frames / total_time if total_time else 0.
+
+    @property
+    def precision(self) -> float:
+        detected = self.true_positives + self.false_positives
+        return self.true_positives / detected if detected else 0.
+
+    @property
+    def recall(self) -> float:
+        expected = self.true_positives + self.false_negatives
+        return self.true_positives / expected if expected else 0.
+
+    @property
+    def label_accuracy(self) -> float:
+        return self.label_matches / self.true_positives if self.true_positives else 0.
+
+    def toJson(self) -> dict:
+        return {'frames': self.frames,
+                'fps': self.fps,
+                'wall_fps': self.wall_fps,
+                'stages': {name: summarise(times) for name, times in self.stage_times.items()},
+                'accuracy': {'annotated_frames': self.annotated_frames,
+                             'precision': self.precision,
+                             'recall': self.recall,
+                             'label_accuracy': self.label_accuracy}}
+
+    def __str__(self) -> str:
+        lines = [f"Frames: {self.frames}, {self.fps:.1f} fps ({self.wall_fps:.1f} fps including loading)"]
+        for name, times in self.stage_times.items():
+            summary = summarise(times)
+            lines.append(f"  {name}: mean {summary['mean'] * 1e3:.3f} ms, p50 {summary['p50'] * 1e3:.3f} ms, "
+                         f"p95 {summary['p95'] * 1e3:.3f} ms")
+        if self.annotated_frames:
+            lines.append(f"Accuracy over {self.annotated_frames} annotated frames: precision {self.precision:.3f}, "
+                         f"recall {self.recall:.3f}, label accuracy {self.label_accuracy:.3f}")
+        return '\n'.join(lines)
+
+
+def matchBoxes(detected: list, expected: list, threshold: float = 0.5) -> list:
+    """
+    Greedily pair each expected bounding box with the unmatched detected
+    bounding box of largest decimal overlap.
+
+    :param detected: Detected bounding boxes, should be a list[BoundingBox]
+    :param expected: Ground-truth bounding boxes, should be a list[BoundingBox]
+    :param threshold: Minimum decimal area overlap of a match, should be a float
+    :return: matches - list[tuple[int, int]]
+    """
+    matches, used = [], set()
+    for i, truth in enumerate(expected):
+        best, best_overlap = None, threshold
+        for j, box in enumerate(detected):
+            if j in used:
+                continue
+            overlap = truth.getDecimalOverlap(box)[0]
+            if overlap >= best_overlap:
+                best, best_overlap = j, overlap
+        if best is not None:
+            used.add(best)
+            matches.append((i, best))
+    return matches
+
+
+def loadStage(path: str) -> Callable:
+    """
+    Import a stage callable from a 'module:attribute' path.
+
+    :param path: Import path of the callable, should be a str
+    :return: stage - Callable
+    """
+    module_name, _, attr = path.partition(':')
+    if not attr:
+        raise ValueError(f"Stage must be given as 'module:attribute', got: '{path}'")
+    stage = getattr(importlib.import_module(module_name), attr)
+    if not callable(stage):
+        raise TypeError(f"'{path}': Expected type 'Callable', got '{type(stage).__name__}'")
+    return stage
+
+
+class ReplayHarness(object):
+    def __init__(self, frames_dir: str, stages: list | tuple | dict, detection_stage: str = None,
+                 mmap: bool = True, threshold: float = 0.5):
+        """
+        Replays recorded frames through the pipeline stages without a game
+        window. Frames are '.npy' arrays, memory-mapped when possible, or
+        '.pkl' and '.exb' files read by utils.load. Ground-truth
+        annotations are optional '.json' files sharing the frame name,
+        holding 'boxes' and optionally 'labels'.
+
+        :param frames_dir: Directory of the recorded frames, should be a str
+        :param stages: Ordered stages, each receiving the previous output, should be a
+         list[tuple[str, Callable]] | dict[str: Callable]
+        :param detection_stage: Name of the stage returning bounding boxes, should be a str
+        :param mmap: Whether to memory-map '.npy' frames, should be a bool
+        :param threshold: Minimum decimal area overlap of a detection, should be a float
+        """
+        self.frames_dir = frames_dir
+        self.stages = list(stages.items()) if isinstance(stages, dict) else list(stages)
+        if not self.stages:
+            raise ValueError("At least one stage is required")
+        self.detection_stage = self.stages[0][0] if detection_stage is None else detection_stage
+        if self.detection_stage not in [name for name, _ in self.stages]:
+            raise ValueError(f"Detection stage '{self.detection_stage}' is not a given stage")
+        self.mmap = mmap
+        self.threshold = threshold
+
+        _, self.frame_names = utils.listPath(frames_dir, ext=FRAME_EXTS, errors='raise')
+        self.frame_names.sort()
+
+    def loadFrame(self, name: str) -> Any:
+        if name.endswith('.npy'):
+            return np.load(utils.joinPath(self.frames_dir, name), mmap_mode='r' if self.mmap else None)
+        return utils.load(self.frames_dir, name)
+
+    def loadAnnotation(self, name: str) -> tuple | None:
+        annotation_name = f"{os.path.splitext(name)[0]}.json"
+        if not utils.existPath(self.frames_dir, annotation_name):
+            return None
+        annotation = utils.load(self.frames_dir, annotation_name)
+        return ([box if isinstance(box, BoundingBox) else BoundingBox(box) for box in annotation.get('boxes', [])],
+                annotation.get('labels'))
+
+    def run(self, limit: int = None, repeat: int = 1) -> ReplayResult:
+        """
+        Run every frame through the stages as fast as possible.
+
+        :param limit: Maximum number of frames per pass, should be an int
+        :param repeat: Number of passes over the frames, should be an int
+        :return: result - ReplayResult
+        """
+        result = ReplayResult([name for name, _ in self.stages])
+        names = self.frame_names[:limit] if limit else self.frame_names
+
+        for _ in range(repeat):
+            for name in names:
+                start = time.perf_counter()
+                frame = self.loadFrame(name)
+                annotation = self.loadAnnotation(name)
+                result.load_time += time.perf_counter() - start
+
+                data, detections = frame, None
+                for stage_name, stage in self.stages:
+                    start = time.perf_counter()
+                    data = stage(data)
+                    elapsed = time.perf_counter() - start
+                    result.stage_times[stage_name].append(elapsed)
+                    result.process_time += elapsed
+                    if stage_name == self.detection_stage:
+                        detections = data
+                result.frames += 1
+
+                if annotation is not None:
+                    self.score(result, detections, *annotation)
+        _logger.debug(f"Replayed {result.frames} frames from '{self.frames_dir}'")
+        return result
+
+    def score(self, result: ReplayResult, detections: Any, expected: list, expected_labels: list = None) -> None:
+        """Accumulate the accuracy of detections against the ground-truth"""
+        labels = None
+        # Detections with labels, unlike a tuple of two boxes
+        if isinstance(detections, tuple) and len(detections) == 2 \
+                and isinstance(detections[0], (list, tuple, np.ndarray)):
+            detections, labels = detections
+        if detections is None:
+            detected = []
+        elif isinstance(detections, np.ndarray):
+            detected = box_array.fromArray(detections)
+        else:
+            detected = [box if isinstance(box, BoundingBox) else BoundingBox(box.bounding_box) for box in detections]
+
+        matches = matchBoxes(detected, expected, threshold=self.threshold)
+        result.annotated_frames += 1
+        result.true_positives += len(matches)
+        result.false_positives += len(detected) - len(matches)
+        result.false_negatives += len(expected) - len(matches)
+        if labels is not None and expected_labels is not None:
+            result.label_matches += sum(labels[j] == expected_labels[i] for i, j in matches)
+
+
+def main(argv: list = None) -> ReplayResult:
+    parser = argparse.ArgumentParser(prog='replay', description="Replay recorded frames through pipeline stages")
+    parser.add_argument('frames_dir', help="directory of recorded frames and annotations")
+    parser.add_argument('--stage', action='append', default=[], metavar='NAME=MODULE:ATTR',
+                        help="pipeline stage, repeat in pipeline order")
+    parser.add_argument('--detection-stage', help="name of the stage returning bounding boxes")
+    parser.add_argument('--threshold', type=float, default=0.5, help="minimum decimal overlap of a detection")
+    parser.add_argument('--limit', type=int, help="maximum number of frames per pass")
+    parser.add_argument('--repeat', type=int, default=1, help="number of passes over the frames")
+    parser.add_argument('--no-mmap', action='store_true', help="read frames into memory instead")
+    parser.add_argument('--output', help="save the results to this '.json' file")
+    args = parser.parse_args(argv)
+
+    stages = []
+    for stage in args.stage:
+        name, _, path = stage.partition('=')
+        stages.append((name, loadStage(path)))
+
+    harness = ReplayHarness(args.frames_dir, stages, detection_stage=args.detection_stage,
+                            mmap=not args.no_mmap, threshold=args.threshold)
+    result = harness.run(limit=args.limit, repeat=args.repeat)
+    print(result)
+    if args.output:
+        utils.save(*os.path.split(os.path.abspath(args.output)), result.toJson())
+    return result
+
+
+if __name__ == '__main__':
+    main()
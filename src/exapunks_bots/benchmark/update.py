@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import argparse
+import time
+
+from ..utils import utils
+from ..utils.stats import summarise
+
+
+class _Settings(object):
+    def __init__(self):
+        self.capture_fps = 30
+        self.cpu_budget = 0.5
+        self.window_title = 'EXAPUNKS'
+        self.debug = False
+        self.card_scale = 1.
+
+
+PAYLOAD = {'captureFps': 60, 'cpuBudget': 0.25, 'windowTitle': 'EXAPUNKS', 'debug': True, 'cardScale': 0.5,
+           'unknownKey': None}
+
+
+def main(argv: list = None) -> dict:
+    parser = argparse.ArgumentParser(prog='update', description="Measure the throughput of update and updateMany")
+    parser.add_argument('--size', type=int, default=10000, help="number of objects updated per run")
+    parser.add_argument('--repeat', type=int, default=10, help="number of timed runs")
+    args = parser.parse_args(argv)
+
+    objs = [_Settings() for _ in range(args.size)]
+    payloads = [dict(PAYLOAD) for _ in range(args.size)]
+    runs = {
+        'update': lambda: [utils.update(obj, payload) for obj, payload in zip(objs, payloads)],
+        'updateMany': lambda: utils.updateMany(objs, payloads),
+        'updateMany (shared payload)': lambda: utils.updateMany(objs, PAYLOAD),
+    }
+
+    results = {}
+    for name, run in runs.items():
+        times = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+        results[name] = summarise(times)
+        print(f"{name}: {args.size / results[name]['p50']:,.0f} objects/s")
+    return results
+
+
+if __name__ == '__main__':
+    main()
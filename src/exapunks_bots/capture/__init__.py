@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from ..utils.lazy import lazyAttrs
+
+# Attributes loaded on first access, as their modules import numpy
+_LAZY_ATTRS = {
+    'CaptureScheduler': '.scheduler',
+    'frameDiff': '.scheduler',
+    'GameInstance': '.windows',
+    'MockWindowBackend': '.windows',
+    'PyGetWindowBackend': '.windows',
+    'Supervisor': '.windows',
+    'Window': '.windows',
+}
+
+__all__ = sorted(_LAZY_ATTRS)
+__getattr__, __dir__ = lazyAttrs(__name__, _LAZY_ATTRS)
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import collections
+import logging
+import threading
+import time
+from typing import Callable
+
+import numpy as np
+
+from ..utils import Config
+
+_logger = logging.getLogger(__name__)
+
+
+def frameDiff(previous: np.ndarray | None, current: np.ndarray, step: int = 4) -> float:
+    """
+    Mean absolute difference of sparsely sampled pixels of two frames.
+
+    :param previous: Previous frame, should be a ndarray | None
+    :param current: Current frame, should be a ndarray
+    :param step: Sampling stride in pixels, should be an int
+    :return: difference - float
+    """
+    if previous is None or previous.shape != current.shape:
+        return float('inf')
+    return float(np.abs(previous[::step, ::step].astype(np.int16) - current[::step, ::step]).mean())
+
+
+class CaptureScheduler(object):
+    def __init__(self, capture: Callable, min_fps: float = 2., max_fps: float = 60., backoff: float = 2.,
+                 burst: float = 0.5, diff_threshold: float = 1., cpu_budget: float = 0.25, window: float = 1.):
+        """
+        Captures frames at max_fps right after an input action or a change
+        of the frame, then backs off exponentially to min_fps while the
+        frames are unchanged. The frame rate is lowered further when the
+        capture would use more than the CPU budget.
+
+        :param capture: Returns a frame of the game window, should be a Callable[[], ndarray]
+        :param min_fps: Frame rate of a static board, should be a float
+        :param max_fps: Frame rate after an input or change, should be a float
+        :param backoff: Multiplier of the frame interval per unchanged frame, should be a float
+        :param burst: Seconds of max_fps after an input action, should be a float
+        :param diff_threshold: Minimum frame difference of a change, should be a float
+        :param cpu_budget: Maximum CPU seconds per second of capturing, should be a float
+        :param window: Seconds of history of the reported rates, should be a float
+        """
+        if not 0 < min_fps <= max_fps:
+            raise ValueError(f"Expected 0 < min_fps <= max_fps, got: {min_fps}, {max_fps}")
+        self.capture = capture
+        self.min_fps = min_fps
+        self.max_fps = max_fps
+        self.backoff = backoff
+        self.burst = burst
+        self.diff_threshold = diff_threshold
+        self.cpu_budget = cpu_budget
+        self.window = window
+
+        self.interval = 1 / max_fps
+        self.frame = None
+        self._next_time = time.monotonic()
+        self._burst_until = 0.
+        self._history = collections.deque()  # time, CPU seconds of each frame
+        self._lock = threading.Lock()
+
+    @classmethod
+    def fromConfig(cls, capture: Callable, config: Config) -> CaptureScheduler:
+        """Create a scheduler from the 'CAPTURE_*' attributes of the config"""
+        return cls(capture,
+                   min_fps=getattr(config, 'CAPTURE_MIN_FPS', 2.),
+                   max_fps=getattr(config, 'CAPTURE_MAX_FPS', 60.),
+                   backoff=getattr(config, 'CAPTURE_BACKOFF', 2.),
+                   burst=getattr(config, 'CAPTURE_BURST', 0.5),
+                   diff_threshold=getattr(config, 'CAPTURE_DIFF_THRESHOLD', 1.),
+                   cpu_budget=getattr(config, 'CAPTURE_CPU_BUDGET', 0.25))
+
+    @property
+    def effective_fps(self) -> float:
+        """Frames captured per second over the history window"""
+        with self._lock:
+            self._trim(time.monotonic())
+            return len(self._history) / self.window
+
+    @property
+    def cpu_usage(self) -> float:
+        """CPU seconds used per second by capturing, over the history window"""
+        with self._lock:
+            self._trim(time.monotonic())
+            return sum(cpu for _, cpu in self._history) / self.window
+
+    @property
+    def remaining(self) -> float:
+        """Seconds until the next capture is due, negative when overdue"""
+        with self._lock:
+            return self._next_time - time.monotonic()
+
+    def _trim(self, now: float) -> None:
+        while self._history and self._history[0][0] < now - self.window:
+            self._history.popleft()
+
+    def notifyInput(self) -> None:
+        """Capture at max_fps, an input action was just executed"""
+        with self._lock:
+            now = time.monotonic()
+            self._burst_until = now + self.burst
+            self.interval = 1 / self.max_fps
+            self._next_time = min(self._next_time, now)
+
+    def step(self) -> tuple:
+        """
+        Capture a frame and schedule the next capture.
+
+        :return: frame, changed - tuple[ndarray, bool]
+        """
+        cpu_start = time.thread_time()
+        frame = self.capture()
+        changed = frameDiff(self.frame, frame) >= self.diff_threshold
+        cpu = time.thread_time() - cpu_start
+        self.frame = frame
+
+        with self._lock:
+            now = time.monotonic()
+            self._history.append((now, cpu))
+            self._trim(now)
+            if changed or now < self._burst_until:
+                interval = 1 / self.max_fps
+            else:
+                interval = min(self.interval * self.backoff, 1 / self.min_fps)
+            if self.cpu_budget and cpu / interval > self.cpu_budget:
+                interval = cpu / self.cpu_budget
+            self.interval = interval
+            self._next_time = now + interval
+        return frame, changed
+
+    def wait(self, stop: threading.Event = None) -> None:
+        """Sleep until the next capture is due, or an input is notified"""
+        while True:
+            remaining = self.remaining
+            if remaining <= 0 or (stop is not None and stop.is_set()):
+                return
+            # Sleep in slices so that a notified input shortens the wait
+            time.sleep(min(remaining, 1 / self.max_fps))
+
+    def run(self, callback: Callable, stop: threading.Event) -> None:
+        """
+        Capture until stopped, passing each frame to the callback.
+
+        :param callback: Receives each frame and whether it changed, should be a Callable[[ndarray, bool], Any]
+        :param stop: Event stopping the capture when set, should be a threading.Event
+        :return: - None
+        """
+        while not stop.is_set():
+            self.wait(stop)
+            if stop.is_set():
+                break
+            callback(*self.step())
@@ -0,0 +1,367 @@
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+import numpy as np
+
+from ..utils import BoundingBox
+from .scheduler import CaptureScheduler
+
+_logger = logging.getLogger(__name__)
+
+# Serializes input of backends driving the single OS cursor and keyboard focus
+INPUT_LOCK = threading.Lock()
+
+
+class Window(object):
+    def __init__(self, handle: Any, title: str, roi: BoundingBox):
+        """
+        Game window found by a backend.
+
+        :param handle: Identifier of the window, stable while it is open, should be a Hashable
+        :param title: Title of the window, should be a str
+        :param roi: Screen region of the window, should be a BoundingBox
+        """
+        self.handle = handle
+        self.title = title
+        self.roi = roi
+
+    def __repr__(self) -> str:
+        return f"Window({self.handle!r}, {self.title!r}, {self.roi})"
+
+
+class PyGetWindowBackend(object):
+    # Every window shares the OS cursor and keyboard focus
+    serial_input = True
+
+    def __init__(self):
+        """
+        Finds windows with PyGetWindow, captures their screen region with
+        Pillow and sends input with PyAutoGUI, after activating the window.
+        Input actions are given relative to the window:
+        ('click', x, y), ('drag', x1, y1, x2, y2) or ('key', name).
+        """
+        import pyautogui  # Slow to import and needs a display
+        import pygetwindow
+        from PIL import ImageGrab
+
+        self._pyautogui = pyautogui
+        self._pygetwindow = pygetwindow
+        self._image_grab = ImageGrab
+        self._windows = {}
+
+    def findWindows(self, title: str) -> list:
+        windows = []
+        self._windows = {}
+        for window in self._pygetwindow.getWindowsWithTitle(title):
+            if window.isMinimized or window.width <= 0 or window.height <= 0:
+                continue
+            handle = getattr(window, '_hWnd', id(window))
+            self._windows[handle] = window
+            roi = BoundingBox(window.left, window.top, window.left + window.width, window.top + window.height)
+            windows.append(Window(handle, window.title, roi))
+        return windows
+
+    def capture(self, window: Window) -> np.ndarray:
+        image = self._image_grab.grab(bbox=tuple(window.roi.bounding_box), all_screens=True)
+        # RGB to the BGR channel order of the vision modules
+        return np.asarray(image)[..., 2::-1]
+
+    def sendInput(self, window: Window, action: tuple) -> None:
+        if window.handle in self._windows:
+            self._windows[window.handle].activate()
+        kind, *args = action
+        x1, y1 = window.roi.pos1
+        if kind == 'click':
+            self._pyautogui.click(x1 + args[0], y1 + args[1])
+        elif kind == 'drag':
+            self._pyautogui.moveTo(x1 + args[0], y1 + args[1])
+            self._pyautogui.dragTo(x1 + args[2], y1 + args[3], button='left')
+        elif kind == 'key':
+            self._pyautogui.press(args[0])
+        else:
+            raise ValueError(f"Unknown input action '{kind}'")
+
+
+class MockWindowBackend(object):
+    def __init__(self, rois: list | tuple, render: Callable = None, title: str = 'EXAPUNKS',
+                 serial_input: bool = True, input_delay: float = 0.):
+        """
+        Headless backend of fake windows, for testing without a display.
+        Frames come from the render callable, or are blank. Inputs are
+        recorded, along with the most inputs that were ever sent at once.
+
+        :param rois: Screen region of each window, should be a list[BoundingBox]
+        :param render: Returns the frame of a window, should be a Callable[[Window], ndarray]
+        :param title: Title of every window, should be a str
+        :param serial_input: Whether input must be serialized like an OS cursor, should be a bool
+        :param input_delay: Seconds taken by each input, should be a float
+        """
+        self.windows = [Window(i, title, roi) for i, roi in enumerate(rois)]
+        self.render = render
+        self.serial_input = serial_input
+        self.input_delay = input_delay
+
+        self.captures = 0
+        self.inputs = []  # handle, action, time
+        self.max_concurrent_inputs = 0
+        self._concurrent_inputs = 0
+        self._lock = threading.Lock()
+
+    def findWindows(self, title: str) -> list:
+        return [window for window in self.windows if title in window.title]
+
+    def closeWindow(self, handle: Any) -> None:
+        """Close a window, it is no longer found"""
+        self.windows = [window for window in self.windows if window.handle != handle]
+
+    def capture(self, window: Window) -> np.ndarray:
+        with self._lock:
+            self.captures += 1
+        if self.render is not None:
+            return self.render(window)
+        return np.zeros((int(window.roi.height), int(window.roi.width), 3), dtype=np.uint8)
+
+    def sendInput(self, window: Window, action: tuple) -> None:
+        with self._lock:
+            self._concurrent_inputs += 1
+            self.max_concurrent_inputs = max(self.max_concurrent_inputs, self._concurrent_inputs)
+        time.sleep(self.input_delay)
+        with self._lock:
+            self._concurrent_inputs -= 1
+            self.inputs.append((window.handle, action, time.monotonic()))
+
+
+class GameInstance(object):
+    def __init__(self, window: Window, scheduler: CaptureScheduler, workers: int = 1):
+        """
+        A game window driven by the supervisor, with its own capture
+        scheduler, detection workers and input queue.
+
+        :param window: Window of the game, should be a Window
+        :param scheduler: Capture scheduler of the window, should be a CaptureScheduler
+        :param workers: Number of detection worker threads, should be an int
+        """
+        self.window = window
+        self.scheduler = scheduler
+        self.workers = workers
+        self.inputs = queue.Queue()
+        self.detection = None
+
+        self.cpu_time = 0.
+        self.retry_time = 0.
+        self.frames = 0
+        self.detections = 0
+        self.dropped = 0
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f'detect-{window.handle}')
+        self._input_thread = None
+
+    @property
+    def roi(self) -> BoundingBox:
+        return self.window.roi
+
+    def addCpu(self, seconds: float) -> None:
+        with self._lock:
+            self.cpu_time += seconds
+
+    def toJson(self) -> dict:
+        return {'handle': self.window.handle,
+                'roi': self.roi,
+                'frames': self.frames,
+                'detections': self.detections,
+                'dropped': self.dropped,
+                'cpu_time': self.cpu_time,
+                'effective_fps': self.scheduler.effective_fps}
+
+
+class Supervisor(object):
+    def __init__(self, backend: Any, detect: Callable, title: str = 'EXAPUNKS', workers: int = 1,
+                 cpu_budget: float = 0.5, on_detect: Callable = None, **scheduler_kwargs):
+        """
+        Drives every game window matching the title from one host. Frames
+        are captured by a single loop, always serving the due window that
+        has used the least CPU time on capturing and detection, so that
+        windows share the CPU fairly. Each window has its own detection
+        workers and input queue. Frames arriving while every worker of a
+        window is busy are dropped. Input of backends sharing the OS cursor
+        is serialized across windows.
+
+        :param backend: Finds, captures and sends input to windows, should be a PyGetWindowBackend | MockWindowBackend
+        :param detect: Detects the cards of a frame, should be a Callable[[ndarray], Any]
+        :param title: Title of the game windows, should be a str
+        :param workers: Number of detection worker threads per window, should be an int
+        :param cpu_budget: CPU seconds per second of capturing shared by the windows, should be a float
+        :param on_detect: Receives each instance and its detection, should be a Callable[[GameInstance, Any], Any]
+        :param scheduler_kwargs: Arguments of each CaptureScheduler, should be a dict[str: Any]
+        """
+        self.backend = backend
+        self.detect = detect
+        self.title = title
+        self.workers = workers
+        self.cpu_budget = cpu_budget
+        self.on_detect = on_detect
+        self.scheduler_kwargs = scheduler_kwargs
+
+        self.instances = {}  # handle: GameInstance
+        self._stop = threading.Event()
+        self._capture_thread = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> Supervisor:
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def discover(self) -> list:
+        """
+        Find the matching windows, adding an instance for each new window
+        and closing the instances of windows that are gone.
+
+        :return: instances - list[GameInstance]
+        """
+        windows = {window.handle: window for window in self.backend.findWindows(self.title)}
+        with self._lock:
+            for handle in list(self.instances):
+                if handle not in windows:
+                    _logger.info(f"Window {handle!r} was closed")
+                    self._closeInstance(self.instances.pop(handle))
+            for handle, window in windows.items():
+                if handle in self.instances:
+                    self.instances[handle].window.roi = window.roi
+                    continue
+                scheduler = CaptureScheduler(lambda window=window: self.backend.capture(window),
+                                             **self.scheduler_kwargs)
+                instance = GameInstance(window, scheduler, workers=self.workers)
+                self.instances[handle] = instance
+                if self._capture_thread is not None:
+                    self._startInput(instance)
+                _logger.info(f"Found window {handle!r} at {window.roi}")
+
+            # Share the CPU budget between the windows
+            for instance in self.instances.values():
+                instance.scheduler.cpu_budget = self.cpu_budget / len(self.instances)
+            return list(self.instances.values())
+
+    def start(self) -> None:
+        """Discover the windows and start capturing, detecting and sending input"""
+        if self._capture_thread is not None:
+            return
+        self.discover()
+        self._capture_thread = threading.Thread(target=self._captureLoop, name='supervisor-capture', daemon=True)
+        self._capture_thread.start()
+        for instance in list(self.instances.values()):
+            self._startInput(instance)
+
+    def sendInput(self, handle: Any, action: tuple) -> None:
+        """Queue an input action for the window"""
+        self.instances[handle].inputs.put(action)
+
+    def _captureLoop(self) -> None:
+        while not self._stop.is_set():
+            with self._lock:
+                instances = list(self.instances.values())
+            if not instances:
+                self._stop.wait(0.1)
+                continue
+
+            now = time.monotonic()
+            remaining = {instance: max(instance.scheduler.remaining, instance.retry_time - now)
+                         for instance in instances}
+            due = [instance for instance in instances if remaining[instance] <= 0]
+            if not due:
+                # Wait in slices so that a notified input shortens the wait
+                self._stop.wait(min(min(remaining.values()), *(1 / instance.scheduler.max_fps
+                                                               for instance in instances)))
+                continue
+
+            # The due window that has used the least CPU goes first
+            instance = min(due, key=lambda instance_: instance_.cpu_time)
+            cpu_start = time.thread_time()
+            try:
+                frame, changed = instance.scheduler.step()
+            except Exception as e:
+                # Usually a closed or moved window, retried at the slowest frame rate until rediscovered
+                _logger.warning(f"Capture of window {instance.window.handle!r} failed: {e}")
+                instance.retry_time = time.monotonic() + 1 / instance.scheduler.min_fps
+                continue
+            instance.addCpu(time.thread_time() - cpu_start)
+            instance.frames += 1
+            if changed or instance.detection is None:
+                self._submitDetection(instance, frame)
+
+    def _submitDetection(self, instance: GameInstance, frame: np.ndarray) -> None:
+        with instance._lock:
+            if instance._pending >= instance.workers:
+                instance.dropped += 1
+                return
+            instance._pending += 1
+        try:
+            instance._executor.submit(self._runDetection, instance, frame)
+        except RuntimeError:  # The window was closed meanwhile
+            with instance._lock:
+                instance._pending -= 1
+
+    def _runDetection(self, instance: GameInstance, frame: np.ndarray) -> None:
+        cpu_start = time.thread_time()
+        try:
+            detection = self.detect(frame)
+            instance.detection = detection
+            instance.detections += 1
+            if self.on_detect is not None:
+                self.on_detect(instance, detection)
+        except Exception:
+            _logger.exception(f"Detection of window {instance.window.handle!r} failed")
+        finally:
+            instance.addCpu(time.thread_time() - cpu_start)
+            with instance._lock:
+                instance._pending -= 1
+
+    def _startInput(self, instance: GameInstance) -> None:
+        instance._input_thread = threading.Thread(target=self._inputLoop, args=(instance,),
+                                                  name=f'input-{instance.window.handle}', daemon=True)
+        instance._input_thread.start()
+
+    def _inputLoop(self, instance: GameInstance) -> None:
+        while True:
+            action = instance.inputs.get()
+            if action is None:
+                return
+            try:
+                if getattr(self.backend, 'serial_input', True):
+                    with INPUT_LOCK:
+                        self.backend.sendInput(instance.window, action)
+                else:
+                    self.backend.sendInput(instance.window, action)
+            except Exception:
+                _logger.exception(f"Input {action} to window {instance.window.handle!r} failed")
+            instance.scheduler.notifyInput()
+
+    def _closeInstance(self, instance: GameInstance) -> None:
+        instance.inputs.put(None)
+        if instance._input_thread is not None and instance._input_thread is not threading.current_thread():
+            instance._input_thread.join()
+        instance._executor.shutdown(wait=True, cancel_futures=True)
+
+    def close(self) -> None:
+        """Stop capturing, then finish the queued input and running detections"""
+        self._stop.set()
+        if self._capture_thread is not None:
+            self._capture_thread.join()
+            self._capture_thread = None
+        with self._lock:
+            for instance in self.instances.values():
+                self._closeInstance(instance)
+            self.instances.clear()
+
+    @property
+    def stats(self) -> dict:
+        with self._lock:
+            return {handle: instance.toJson() for handle, instance in self.instances.items()}
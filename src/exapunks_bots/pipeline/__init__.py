@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from ..utils.lazy import lazyAttrs
+
+# Attributes loaded on first access, as their modules import numpy and shared memory
+_LAZY_ATTRS = {
+    'FrameRingBuffer': '.ring_buffer',
+}
+
+__all__ = sorted(_LAZY_ATTRS)
+__getattr__, __dir__ = lazyAttrs(__name__, _LAZY_ATTRS)
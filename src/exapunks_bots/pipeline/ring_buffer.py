@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import contextlib
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+_logger = logging.getLogger(__name__)
+
+# Per slot header of the sequence number, -1 while written, and the number of readers
+_SEQUENCE, _READERS = 0, 1
+
+
+class FrameRingBuffer(object):
+    def __init__(self, slots: int, shape: tuple, dtype: str | type = np.uint8, name: str = None,
+                 lock: multiprocessing.Lock = None, create: bool = True):
+        """
+        Fixed number of frame slots in shared memory, exposed as NumPy views
+        so that processes exchange a (slot, sequence) reference instead of
+        the pixels. Slots being read are never overwritten, and a reference
+        to an overwritten slot is detected by its sequence number.
+
+        The buffer can be passed to worker processes, e.g. as a process
+        argument or pool initializer argument, where it attaches to the
+        same shared memory.
+
+        :param slots: Number of frame slots, should be an int
+        :param shape: Shape of each frame, should be a tuple[int]
+        :param dtype: Data type of each frame, should be a str | type
+        :param name: Name of the shared memory block, should be a str
+        :param lock: Lock coordinating readers and the writer, should be a multiprocessing.Lock
+        :param create: Whether to create the shared memory or attach to it, should be a bool
+        """
+        if slots < 1:
+            raise ValueError(f"'slots' must be at least 1, got: {slots}")
+        self.slots = slots
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.lock = multiprocessing.Lock() if lock is None else lock
+        # Forked processes inherit the buffer without unpickling it, so ownership is tied to the creating process
+        self._owner = os.getpid() if create else None
+
+        frame_size = int(np.prod(self.shape)) * self.dtype.itemsize
+        header_size = (slots * 2 + 1) * np.dtype(np.int64).itemsize
+        # Only the creating buffer owns the block, attached buffers must not unlink it on exit
+        track = {} if create or sys.version_info < (3, 13) else {'track': False}
+        self._shm = shared_memory.SharedMemory(name=name, create=create, size=header_size + frame_size * slots,
+                                               **track)
+
+        self._header = np.ndarray((slots, 2), dtype=np.int64, buffer=self._shm.buf)
+        self._counter = np.ndarray((1,), dtype=np.int64, buffer=self._shm.buf, offset=slots * 2 * 8)
+        self._frames = np.ndarray((slots, *self.shape), dtype=self.dtype, buffer=self._shm.buf, offset=header_size)
+        if create:
+            self._header[:] = 0
+            self._counter[0] = 0
+
+    def __getstate__(self) -> dict:
+        return {'slots': self.slots, 'shape': self.shape, 'dtype': self.dtype.str, 'name': self.name,
+                'lock': self.lock}
+
+    def __setstate__(self, state: dict):
+        self.__init__(**state, create=False)
+
+    def __enter__(self) -> FrameRingBuffer:
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def sequence(self) -> int:
+        """Sequence number of the latest written frame"""
+        return int(self._counter[0])
+
+    def write(self, frame: np.ndarray, timeout: float = None) -> tuple:
+        """
+        Copy the frame into the oldest slot without readers.
+
+        :param frame: Frame to be written, should be a ndarray
+        :param timeout: Seconds to wait while every slot is being read, waits forever
+         if None, should be a float
+        :return: slot, sequence - tuple[int, int]
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self.lock:
+                free = np.flatnonzero((self._header[:, _READERS] == 0) & (self._header[:, _SEQUENCE] >= 0))
+                if len(free):
+                    slot = int(free[self._header[free, _SEQUENCE].argmin()])
+                    self._header[slot, _SEQUENCE] = -1
+                    break
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"Every slot of the ring buffer '{self.name}' is being read")
+            time.sleep(0.0005)
+
+        self._frames[slot] = frame
+        with self.lock:
+            self._counter[0] += 1
+            sequence = int(self._counter[0])
+            self._header[slot, _SEQUENCE] = sequence
+        return slot, sequence
+
+    def latest(self) -> tuple | None:
+        """Reference to the latest written frame, as (slot, sequence)"""
+        with self.lock:
+            sequence = int(self._counter[0])
+            slots = np.flatnonzero(self._header[:, _SEQUENCE] == sequence)
+        return (int(slots[0]), sequence) if sequence and len(slots) else None
+
+    def acquire(self, slot: int, sequence: int) -> np.ndarray | None:
+        """
+        Hold the slot for reading and return a read-only view of its frame,
+        or None if the slot has since been overwritten.
+
+        :param slot: Index of the slot, should be an int
+        :param sequence: Expected sequence number of the frame, should be an int
+        :return: frame - ndarray | None
+        """
+        with self.lock:
+            if self._header[slot, _SEQUENCE] != sequence:
+                return None
+            self._header[slot, _READERS] += 1
+        view = self._frames[slot].view()
+        view.flags.writeable = False
+        return view
+
+    def release(self, slot: int) -> None:
+        with self.lock:
+            if self._header[slot, _READERS] > 0:
+                self._header[slot, _READERS] -= 1
+
+    @contextlib.contextmanager
+    def frame(self, slot: int, sequence: int):
+        """Context of acquire, releasing the slot on exit"""
+        view = self.acquire(slot, sequence)
+        try:
+            yield view
+        finally:
+            if view is not None:
+                self.release(slot)
+
+    def close(self) -> None:
+        """Detach from the shared memory, unlinking it if this is the creating buffer"""
+        self._header = self._counter = self._frames = None
+        self._shm.close()
+        if self._owner == os.getpid():
+            self._shm.unlink()
+        self._owner = None
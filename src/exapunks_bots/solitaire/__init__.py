@@ -0,0 +1,6 @@
+from __future__ import annotations
+
+from . import cards
+from .planner import SpeculativePlanner
+from .solver import Plan, Solver
+from .state import GameState, Move
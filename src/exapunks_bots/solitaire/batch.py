@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from ..utils import utils
+from ..utils.stats import summarise
+from .solver import Solver
+from .state import GameState
+
+_logger = logging.getLogger(__name__)
+
+DEAL_EXTS = ('json', 'exb')
+
+
+def loadDeal(path: str) -> GameState | None:
+    """
+    Load a deal saved as a GameState, or as json holding 'columns' or a
+    shuffled 'deck'. Other files return None.
+
+    :param path: Path of the deal file, should be a str
+    :return: state - GameState | None
+    """
+    data = utils.load(*os.path.split(path))
+    if isinstance(data, GameState):
+        return data
+    if isinstance(data, dict):
+        if 'columns' in data:
+            return GameState.fromJson(data)
+        if 'deck' in data:
+            return GameState.deal(data['deck'])
+    return None
+
+
+def findDeals(deals_dir: str) -> list:
+    """Paths of the deal files within the directory, in name order"""
+    _, paths = utils.listPath(deals_dir, ext=DEAL_EXTS, return_file_path=True, errors='raise')
+    return sorted(paths)
+
+
+def solveDeal(path: str, time_limit: float = None, max_nodes: int = 200000) -> dict:
+    """
+    Solve a deal file, the job of a batch worker process.
+
+    :param path: Path of the deal file, should be a str
+    :param time_limit: Maximum seconds of searching, should be a float
+    :param max_nodes: Maximum number of expanded states, should be an int
+    :return: result - dict[str: Any]
+    """
+    result = {'deal': utils.getLastPath(path), 'solved': False, 'moves': None, 'nodes': 0, 'elapsed': 0.}
+    start = time.perf_counter()
+    try:
+        state = loadDeal(path)
+        if state is None:
+            result['error'] = "Not a deal"
+            return result
+        plan = Solver(max_nodes=max_nodes, time_limit=time_limit).solve(state)
+        result.update(solved=plan.solved, moves=[list(move) for move in plan.moves] if plan.solved else None,
+                      nodes=plan.nodes)
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['elapsed'] = time.perf_counter() - start
+    return result
+
+
+def runBatch(deals_dir: str, results_path: str, workers: int = None, time_limit: float = 10.,
+             max_nodes: int = 200000) -> dict:
+    """
+    Solve every deal of the directory in a process pool, appending each
+    result to a json lines file as it completes.
+
+    :param deals_dir: Directory of the deal files, should be a str
+    :param results_path: Path of the append-only results file, should be a str
+    :param workers: Number of worker processes, the CPU count if None, should be an int
+    :param time_limit: Maximum seconds of searching per deal, should be a float
+    :param max_nodes: Maximum number of expanded states per deal, should be an int
+    :return: summary - dict[str: Any]
+    """
+    paths = findDeals(deals_dir)
+    _logger.info(f"Solving {len(paths)} deals from '{deals_dir}'")
+
+    latencies, solved, errors = [], 0, 0
+    start = time.perf_counter()
+    with open(results_path, 'a', encoding='utf-8') as file, ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(solveDeal, path, time_limit, max_nodes) for path in paths]
+        for future in as_completed(futures):
+            result = future.result()
+            if result.get('error') == "Not a deal":
+                continue
+            file.write(json.dumps(result, default=utils.toJson) + '\n')
+            file.flush()
+            latencies.append(result['elapsed'])
+            solved += result['solved']
+            errors += 'error' in result
+    elapsed = time.perf_counter() - start
+
+    summary = {'deals': len(latencies),
+               'solved': solved,
+               'errors': errors,
+               'win_rate': solved / len(latencies) if latencies else 0.,
+               'elapsed': elapsed,
+               'throughput': len(latencies) / elapsed if elapsed else 0.,
+               'latency': summarise(latencies)}
+    _logger.info(f"Solved {solved} of {len(latencies)} deals in {elapsed:.1f}s")
+    return summary
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+# Exapunks solitaire deck of 36 cards, number cards 6 to 10 of each suit and
+# four of each face card. Cards are compact ids, number cards first.
+SUITS = ('C', 'S', 'H', 'D')  # Clubs and spades are black, hearts and diamonds red
+RANKS = (6, 7, 8, 9, 10)
+FACES = ('J', 'Q', 'K', 'A')
+
+NUMBER_CARDS = len(SUITS) * len(RANKS)
+DECK_SIZE = NUMBER_CARDS + len(FACES) * len(SUITS)
+DECK = tuple(range(DECK_SIZE))
+
+
+def makeCard(value: int | str, suit: str) -> int:
+    """
+    Find the id of a card.
+
+    :param value: Rank of a number card or a face, should be an int | str
+    :param suit: Suit of the card, should be a str
+    :return: card - int
+    """
+    if value in FACES:
+        return NUMBER_CARDS + FACES.index(value) * len(SUITS) + SUITS.index(suit)
+    return SUITS.index(suit) * len(RANKS) + RANKS.index(int(value))
+
+
+def isFace(card: int) -> bool:
+    return card >= NUMBER_CARDS
+
+
+def rank(card: int) -> int | None:
+    """Rank of a number card, None for face cards"""
+    return None if card >= NUMBER_CARDS else RANKS[card % len(RANKS)]
+
+
+def face(card: int) -> str | None:
+    """Face of a face card, None for number cards"""
+    return FACES[(card - NUMBER_CARDS) // len(SUITS)] if card >= NUMBER_CARDS else None
+
+
+def suit(card: int) -> str:
+    if card >= NUMBER_CARDS:
+        return SUITS[(card - NUMBER_CARDS) % len(SUITS)]
+    return SUITS[card // len(RANKS)]
+
+
+def isRed(card: int) -> bool:
+    return suit(card) in ('H', 'D')
+
+
+def cardName(card: int) -> str:
+    """Short name of a card, such as '10H' or 'KS'"""
+    return f"{rank(card) if card < NUMBER_CARDS else face(card)}{suit(card)}"
+
+
+def parseCard(name: str) -> int:
+    """Id of a card from its short name"""
+    return makeCard(name[:-1], name[-1])
+
+
+def canStack(card: int, onto: int) -> bool:
+    """
+    Whether the card can be placed onto the other card. Number cards
+    stack in descending rank of alternating colour, face cards only
+    stack onto the same face.
+
+    :param card: Card to be placed, should be an int
+    :param onto: Card to be placed on, should be an int
+    :return: stackable - bool
+    """
+    if card >= NUMBER_CARDS or onto >= NUMBER_CARDS:
+        return face(card) is not None and face(card) == face(onto)
+    return rank(onto) == rank(card) + 1 and isRed(card) != isRed(onto)
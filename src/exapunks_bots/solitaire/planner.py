@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import collections
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+from .solver import Plan, Solver
+from .state import GameState, Move
+
+_logger = logging.getLogger(__name__)
+
+
+class _Speculation(object):
+    def __init__(self, state: GameState, future: Future, stop: threading.Event):
+        self.state = state
+        self.future = future
+        self.stop = stop
+
+
+class SpeculativePlanner(object):
+    def __init__(self, solver: Solver = None, time_limit: float = 1., history: int = 1000):
+        """
+        Plans a move at a time, searching from the predicted next state on
+        a background worker while the current move is executed. The
+        speculative plan is used when the state observed after the move
+        matches the prediction, otherwise it is dropped.
+
+        :param solver: Solver of the states, should be a Solver
+        :param time_limit: Maximum seconds of searching per move, should be a float
+        :param history: Number of latest idle times kept, should be an int
+        """
+        self.solver = Solver() if solver is None else solver
+        self.time_limit = time_limit
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix='speculation')
+        self._speculation = None
+
+        self.hits = 0
+        self.misses = 0
+        self.idle_times = collections.deque(maxlen=history)
+
+    def __enter__(self) -> SpeculativePlanner:
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of speculative plans that were used"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.
+
+    def _search(self, state: GameState, stop: threading.Event = None) -> Plan:
+        return self.solver.solve(state, time_limit=self.time_limit, stop=stop)
+
+    def speculate(self, state: GameState) -> None:
+        """Start searching from the predicted state in the background"""
+        self.cancel()
+        stop = threading.Event()
+        self._speculation = _Speculation(state, self._worker.submit(self._search, state, stop), stop)
+
+    def cancel(self) -> None:
+        """Drop the current speculation"""
+        if self._speculation is not None:
+            self._speculation.stop.set()
+            self._speculation.future.cancel()
+            self._speculation = None
+
+    def plan(self, state: GameState) -> Plan:
+        """
+        Plan from the observed state, using the speculative plan when it
+        was searched from the same state.
+
+        :param state: Observed state, should be a GameState
+        :return: plan - Plan
+        """
+        speculation, self._speculation = self._speculation, None
+        if speculation is not None:
+            if speculation.state == state:
+                self.hits += 1
+                return speculation.future.result()
+            self.misses += 1
+            speculation.stop.set()
+            speculation.future.cancel()
+            _logger.debug("Observed state does not match the prediction, speculation dropped")
+        return self._search(state)
+
+    def play(self, observe: Callable, execute: Callable, max_moves: int = None) -> GameState:
+        """
+        Play until won, out of moves or the move limit is reached.
+
+        :param observe: Returns the current state of the game, should be a Callable[[], GameState]
+        :param execute: Applies a move to the game, should be a Callable[[Move], None]
+        :param max_moves: Maximum number of moves, should be an int
+        :return: state - GameState
+        """
+        state = observe()
+        moves = 0
+        while not state.isWon() and (max_moves is None or moves < max_moves):
+            start = time.perf_counter()
+            plan = self.plan(state)
+            if moves:
+                self.idle_times.append(time.perf_counter() - start)
+            if not plan.moves:
+                _logger.info("No moves were found")
+                break
+
+            move: Move = plan.moves[0]
+            self.speculate(state.apply(move))
+            execute(move)
+            state = observe()
+            moves += 1
+        self.cancel()
+        return state
+
+    def close(self) -> None:
+        self.cancel()
+        self._worker.shutdown(wait=True)
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+from . import cards
+from .state import GameState, runLength
+
+_logger = logging.getLogger(__name__)
+
+
+def heuristic(state: GameState) -> int:
+    """
+    Estimate the remaining work of a state, the cards not yet in the
+    stack on top of their column, plus the free cell card.
+
+    :param state: State to be estimated, should be a GameState
+    :return: cost - int
+    """
+    cost = 0 if state.free_cell is None else 1
+    for column, collapsed in zip(state.columns, state.collapsed):
+        if collapsed or not column:
+            continue
+        cost += len(column) - runLength(column)
+        if cards.isFace(column[0]) or cards.rank(column[0]) != cards.RANKS[-1]:
+            cost += 1
+    return cost
+
+
+class Plan(object):
+    def __init__(self, moves: list, solved: bool, nodes: int, elapsed: float):
+        self.moves = moves
+        self.solved = solved
+        self.nodes = nodes
+        self.elapsed = elapsed
+
+    def __len__(self) -> int:
+        return len(self.moves)
+
+    def __repr__(self) -> str:
+        return f"Plan({len(self.moves)} moves, solved={self.solved}, nodes={self.nodes})"
+
+
+class Solver(object):
+    def __init__(self, max_nodes: int = 200000, time_limit: float = None, weight: float = 2.):
+        """
+        Weighted best-first search for a winning sequence of moves. When a
+        limit is reached the path to the most promising state is returned,
+        so the search can be used to choose the next move.
+
+        :param max_nodes: Maximum number of expanded states, should be an int
+        :param time_limit: Maximum seconds of searching, should be a float
+        :param weight: Weight of the heuristic over the path length, should be a float
+        """
+        self.max_nodes = max_nodes
+        self.time_limit = time_limit
+        self.weight = weight
+
+    def solve(self, state: GameState, time_limit: float = None, stop: threading.Event = None) -> Plan:
+        """
+        Search for a winning sequence of moves from the state.
+
+        :param state: State to be searched from, should be a GameState
+        :param time_limit: Maximum seconds of searching, overriding the solver's, should be a float
+        :param stop: Event cancelling the search when set, should be a threading.Event
+        :return: plan - Plan
+        """
+        start = time.perf_counter()
+        time_limit = self.time_limit if time_limit is None else time_limit
+        deadline = None if time_limit is None else start + time_limit
+
+        counter = itertools.count()
+        parents = {state.key: (None, None)}
+        best_key, best_cost = state.key, heuristic(state)
+        queue = [(self.weight * best_cost, next(counter), 0, state)]
+        nodes, solved = 0, False
+
+        while queue and nodes < self.max_nodes:
+            _, _, depth, current = heapq.heappop(queue)
+            if current.isWon():
+                best_key, solved = current.key, True
+                break
+            nodes += 1
+            if nodes % 256 == 0 and ((deadline is not None and time.perf_counter() > deadline)
+                                     or (stop is not None and stop.is_set())):
+                break
+
+            for move in current.moves():
+                child = current.apply(move)
+                if child.key in parents:
+                    continue
+                parents[child.key] = (current.key, move)
+                cost = heuristic(child)
+                if cost < best_cost:
+                    best_key, best_cost = child.key, cost
+                heapq.heappush(queue, (depth + 1 + self.weight * cost, next(counter), depth + 1, child))
+
+        moves, key = [], best_key
+        while parents[key][0] is not None:
+            key, move = parents[key]
+            moves.append(move)
+        moves.reverse()
+
+        elapsed = time.perf_counter() - start
+        _logger.debug(f"Searched {nodes} states in {elapsed:.3f}s, solved: {solved}")
+        return Plan(moves, solved, nodes, elapsed)
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from collections import namedtuple
+
+from ..utils import codec
+from . import cards, tables
+from .tables import runLength
+
+COLUMNS = 9
+CARDS_PER_COLUMN = 4
+FREE_CELL = COLUMNS  # Move source or target index of the free cell
+
+# Move of the top count cards of the source column, or the free cell card, to the target
+Move = namedtuple('Move', ['source', 'target', 'count'])
+
+
+def isCollapsible(column: tuple) -> bool:
+    """Whether the column is exactly the four cards of a face"""
+    return (len(column) == len(cards.SUITS) and cards.isFace(column[0])
+            and all(tables.FACE_IDS[card] == tables.FACE_IDS[column[0]] for card in column))
+
+
+class GameState(object):
+    __slots__ = ('columns', 'free_cell', 'collapsed', '_key')
+
+    def __init__(self, columns: list | tuple, free_cell: int = None, collapsed: list | tuple = None):
+        """
+        Immutable state of the board. Columns list their cards from bottom
+        to top. A column holding the four cards of a face collapses and is
+        no longer playable.
+
+        :param columns: Cards of each column, should be a list[list[int]] | tuple[tuple[int]]
+        :param free_cell: Card in the free cell, should be an int
+        :param collapsed: Whether each column has collapsed, should be a list[bool] | tuple[bool]
+        """
+        self.columns = tuple(tuple(column) for column in columns)
+        self.free_cell = free_cell
+        if collapsed is None:
+            collapsed = [isCollapsible(column) for column in self.columns]
+        self.collapsed = tuple(collapsed)
+        self._key = None
+
+    @classmethod
+    def deal(cls, deck: list | tuple) -> GameState:
+        """Deal a shuffled deck into columns"""
+        if sorted(deck) != list(cards.DECK):
+            raise ValueError(f"Deck must hold each of the {cards.DECK_SIZE} cards once")
+        return cls([deck[i:i + CARDS_PER_COLUMN] for i in range(0, len(deck), CARDS_PER_COLUMN)])
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, GameState):
+            return (self.columns == other.columns and self.free_cell == other.free_cell
+                    and self.collapsed == other.collapsed)
+        return False
+
+    def __hash__(self) -> int:
+        return hash((self.columns, self.free_cell, self.collapsed))
+
+    def __str__(self) -> str:
+        lines = [f"Free cell: {'' if self.free_cell is None else cards.cardName(self.free_cell)}"]
+        for i, column in enumerate(self.columns):
+            lines.append(f"{i}: {'collapsed ' if self.collapsed[i] else ''}"
+                         f"{' '.join(cards.cardName(card) for card in column)}")
+        return '\n'.join(lines)
+
+    def __repr__(self) -> str:
+        return f"GameState({self.columns}, {self.free_cell}, {self.collapsed})"
+
+    def toJson(self) -> dict:
+        return {'columns': self.columns, 'free_cell': self.free_cell, 'collapsed': self.collapsed}
+
+    @classmethod
+    def fromJson(cls, data: dict) -> GameState:
+        return cls(data['columns'], data.get('free_cell'), data.get('collapsed'))
+
+    @property
+    def key(self) -> tuple:
+        """
+        Canonical key of equivalent states, where column order and the
+        suits of face cards do not matter.
+        """
+        if self._key is None:
+            face_ids = [tables.FACE_IDS[card] for card in self.columns_flat]
+            columns, i = [], 0
+            for column, collapsed in zip(self.columns, self.collapsed):
+                columns.append((collapsed, tuple(face_ids[i:i + len(column)])))
+                i += len(column)
+            free_cell = None if self.free_cell is None else tables.FACE_IDS[self.free_cell]
+            self._key = (free_cell, tuple(sorted(columns, key=repr)))
+        return self._key
+
+    @property
+    def columns_flat(self) -> list:
+        return [card for column in self.columns for card in column]
+
+    def isWon(self) -> bool:
+        """Whether every column is empty, collapsed or a complete run of number cards"""
+        if self.free_cell is not None:
+            return False
+        for column, collapsed in zip(self.columns, self.collapsed):
+            if collapsed or not column:
+                continue
+            if len(column) != len(cards.RANKS) or cards.rank(column[0]) != cards.RANKS[-1] \
+                    or runLength(column) != len(column):
+                return False
+        return True
+
+    def moves(self) -> list:
+        """
+        Find the legal moves, skipping moves of a whole column onto an
+        empty column.
+
+        :return: moves - list[Move]
+        """
+        moves = []
+        # Playable targets by their top card, the cards are unique
+        targets, empty = {}, []
+        for target, column in enumerate(self.columns):
+            if not self.collapsed[target]:
+                if column:
+                    targets[column[-1]] = target
+                else:
+                    empty.append(target)
+
+        for source, column in enumerate(self.columns):
+            if self.collapsed[source] or not column:
+                continue
+            for count in range(1, runLength(column) + 1):
+                # Only the few cards in the table can hold the bottom card of the moved run
+                found = [targets[onto] for onto in tables.ONTO_CARDS[column[-count]] if onto in targets]
+                if count < len(column):
+                    found += empty
+                for target in sorted(found):
+                    if target != source:
+                        moves.append(Move(source, target, count))
+            if self.free_cell is None:
+                moves.append(Move(source, FREE_CELL, 1))
+
+        if self.free_cell is not None:
+            found = [targets[onto] for onto in tables.ONTO_CARDS[self.free_cell] if onto in targets]
+            for target in sorted(found + empty):
+                moves.append(Move(FREE_CELL, target, 1))
+        return moves
+
+    def apply(self, move: Move) -> GameState:
+        """
+        Create the state after the move, the move is not checked.
+
+        :param move: Move to be applied, should be a Move
+        :return: state - GameState
+        """
+        columns, free_cell, collapsed = list(self.columns), self.free_cell, list(self.collapsed)
+        if move.source == FREE_CELL:
+            moved, free_cell = (free_cell,), None
+        else:
+            moved = columns[move.source][-move.count:]
+            columns[move.source] = columns[move.source][:-move.count]
+
+        if move.target == FREE_CELL:
+            free_cell = moved[0]
+        else:
+            columns[move.target] = columns[move.target] + moved
+            collapsed[move.target] = isCollapsible(columns[move.target])
+        return GameState(columns, free_cell, collapsed)
+
+
+codec.register('GameState', GameState, lambda state: (state.columns, state.free_cell, state.collapsed),
+               lambda values: GameState(*values))
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from . import cards
+
+# Lookup tables over the compact card ids, built once at import from the
+# rules in cards. CAN_STACK[card][onto] is whether the card can be placed
+# onto the other card and ONTO_CARDS[card] lists the few cards it can be
+# placed onto.
+CAN_STACK = tuple(tuple(cards.canStack(card, onto) for onto in cards.DECK) for card in cards.DECK)
+ONTO_CARDS = tuple(tuple(onto for onto in cards.DECK if CAN_STACK[card][onto]) for card in cards.DECK)
+# Card id of number cards and face of face cards, equivalent cards share a value
+FACE_IDS = tuple(card if card < cards.NUMBER_CARDS else cards.face(card) for card in cards.DECK)
+
+
+def canStack(card: int, onto: int) -> bool:
+    """Whether the card can be placed onto the other card"""
+    return CAN_STACK[card][onto]
+
+
+def runLength(column: list | tuple) -> int:
+    """Number of cards in the valid stack on top of the column"""
+    length = 1 if column else 0
+    for i in range(len(column) - 1, 0, -1):
+        if not CAN_STACK[column[i]][column[i - 1]]:
+            break
+        length += 1
+    return length
@@ -3,6 +3,7 @@ from __future__ import annotations
 import uuid
 
 from .utils import *
+from .cache import Cache, memoize
 from .config import Config
 from .bounding_box import BoundingBox, BoundingBox2
 from .point import Point
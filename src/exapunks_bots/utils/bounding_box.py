@@ -1,16 +1,33 @@
 from __future__ import annotations
 
-import copy
+import operator
+from typing import TYPE_CHECKING, Callable
 
 from .point import Point
 
-from shapely import Polygon
+if TYPE_CHECKING:
+    from shapely import Polygon
+
+
+def _cached(method: Callable) -> property:
+    """Property whose value is kept until the coordinates of the box change"""
+    name = method.__name__
+
+    def getter(self):
+        cache = self._cache
+        if name not in cache:
+            cache[name] = method(self)
+        return cache[name]
+
+    getter.__name__, getter.__doc__ = name, method.__doc__
+    return property(getter)
 
 
 class _BaseBoundingBox(object):
 
     def __init__(self, *values):
-        self._bounding_box = []
+        self._coords = []  # x1, y1, x2, y2
+        self._cache = {}
         self.__call__(*values)
 
     def __call__(self, *values) -> _BaseBoundingBox:
@@ -19,26 +36,41 @@ class _BaseBoundingBox(object):
                 values = values[0]
 
         if len(values) == 2:  # ((x1, y1), (x2, y2))
-            self._bounding_box = [Point(value) for value in values]
+            self._set([values[0][0], values[0][1], values[1][0], values[1][1]])
         elif len(values) == 4:  # (x1, y1, x2, y2)
-            self._bounding_box = [Point(values[:2]), Point(values[2:])]
+            self._set(list(values))
 
-        if not self._bounding_box and values:
+        if not self._coords and values:
             raise ValueError(f"{self.__class__.__name__} does not accept {values}")
         return self
 
+    def __setstate__(self, state: dict):
+        state = dict(state)
+        if '_bounding_box' in state:  # Pickled before the coordinates were stored flat
+            state['_coords'] = [value for point in state.pop('_bounding_box') for value in point.pos]
+        self.__dict__.update(state)
+        self._cache = {}
+
+    def _set(self, coords: list) -> None:
+        """Replace the coordinates, invalidating the cached geometry"""
+        self._coords = coords
+        self._cache.clear()
+
+    def _setCoord(self, index: int, value: int | float) -> None:
+        Point.checkType(value)
+        self._coords[index] = value
+        self._cache.clear()
+
     def __round__(self, n: int = 0):
-        round(self._bounding_box[0], n)
-        round(self._bounding_box[1], n)
+        self._set([round(value, n) for value in self._coords])
 
     def __int__(self):
-        self._bounding_box[0].__int__()
-        self._bounding_box[1].__int__()
+        self._set([int(value) for value in self._coords])
 
     def __getitem__(self, index: int) -> int | float:
         if index > 4:
             raise IndexError("list index out of range, must be less than 4")
-        return self._bounding_box[index // 2][index % 2]
+        return self._coords[index]
 
     def __str__(self) -> str:
         return f"{self.pos1}, {self.pos2}"
@@ -46,121 +78,73 @@ class _BaseBoundingBox(object):
     def __repr__(self) -> str:
         return f"BoundingBox({str(self)})"
 
-    def __add__(self, values: int | float | list | tuple) -> list:
-        _bounding_box = self._bounding_box
+    def _operate(self, values: int | float | list | tuple, operator_: Callable) -> list:
         if isinstance(values, (list, tuple)):
             if len(values) == 2:
-                _bounding_box[0] += values
-                _bounding_box[1] += values
-                return _bounding_box
-            elif len(values) == 4:
-                _bounding_box[0] += values[:2]
-                _bounding_box[1] += values[2:]
-                return _bounding_box
+                values = [values[0], values[1], values[0], values[1]]
+            elif len(values) != 4:
+                raise ValueError(f"{self.__class__.__name__} expects 1, 2 or 4 values, got {len(values)}")
         elif isinstance(values, (int, float)):
-            _bounding_box[0] += values
-            _bounding_box[1] += values
-            return _bounding_box
+            values = [values] * 4
+        else:
+            raise TypeError(f"{self.__class__.__name__} values must be an int, float, list or tuple, "
+                            f"not {type(values).__name__}")
+        return [operator_(value, other) for value, other in zip(self._coords, values)]
+
+    def __add__(self, values: int | float | list | tuple) -> list:
+        return self._operate(values, operator.add)
 
     def __sub__(self, values: int | float | list | tuple) -> list:
-        _bounding_box = self._bounding_box
-        if isinstance(values, (list, tuple)):
-            if len(values) == 2:
-                _bounding_box[0] -= values
-                _bounding_box[1] -= values
-                return _bounding_box
-            elif len(values) == 4:
-                _bounding_box[0] -= values[:2]
-                _bounding_box[1] -= values[2:]
-                return _bounding_box
-        elif isinstance(values, (int, float)):
-            _bounding_box[0] -= values
-            _bounding_box[1] -= values
-            return _bounding_box
+        return self._operate(values, operator.sub)
 
     def __mul__(self, values: int | float | list | tuple) -> list:
-        _bounding_box = self._bounding_box
-        if isinstance(values, (list, tuple)):
-            if len(values) == 2:
-                _bounding_box[0] *= values
-                _bounding_box[1] *= values
-                return _bounding_box
-            elif len(values) == 4:
-                _bounding_box[0] *= values[:2]
-                _bounding_box[1] *= values[2:]
-                return _bounding_box
-        elif isinstance(values, (int, float)):
-            _bounding_box[0] *= values
-            _bounding_box[1] *= values
-            return _bounding_box
+        return self._operate(values, operator.mul)
 
     def __floordiv__(self, values: int | float | list | tuple) -> list:
-        _bounding_box = self._bounding_box
-        if isinstance(values, (list, tuple)):
-            if len(values) == 2:
-                _bounding_box[0] //= values
-                _bounding_box[1] //= values
-                return _bounding_box
-            elif len(values) == 4:
-                _bounding_box[0] //= values[:2]
-                _bounding_box[1] //= values[2:]
-                return _bounding_box
-        elif isinstance(values, (int, float)):
-            _bounding_box[0] //= values
-            _bounding_box[1] //= values
-            return _bounding_box
+        return self._operate(values, operator.floordiv)
 
     def __truediv__(self, values: int | float | list | tuple) -> list:
-        _bounding_box = self._bounding_box
-        if isinstance(values, (list, tuple)):
-            if len(values) == 2:
-                _bounding_box[0] /= values
-                _bounding_box[1] /= values
-                return _bounding_box
-            elif len(values) == 4:
-                _bounding_box[0] /= values[:2]
-                _bounding_box[1] /= values[2:]
-                return _bounding_box
-        elif isinstance(values, (int, float)):
-            _bounding_box[0] /= values
-            _bounding_box[1] /= values
-            return _bounding_box
+        return self._operate(values, operator.truediv)
 
     def __iadd__(self, values) -> _BaseBoundingBox:
-        self._bounding_box = self.__add__(values)
+        self._set(self.__add__(values))
         return self
 
     def __isub__(self, values) -> _BaseBoundingBox:
-        self._bounding_box = self.__sub__(values)
+        self._set(self.__sub__(values))
         return self
 
     def __imul__(self, values) -> _BaseBoundingBox:
-        self._bounding_box = self.__mul__(values)
+        self._set(self.__mul__(values))
         return self
 
     def __ifloordiv__(self, values) -> _BaseBoundingBox:
-        self._bounding_box = self.__floordiv__(values)
+        self._set(self.__floordiv__(values))
         return self
 
     def __itruediv__(self, values) -> _BaseBoundingBox:
-        self._bounding_box = self.__truediv__(values)
+        self._set(self.__truediv__(values))
         return self
 
     def toJson(self) -> list:
-        return self._bounding_box
+        return [self.pos1, self.pos2]
 
     def merge(self, *bounding_boxes):
         if len(bounding_boxes) == 1 and isinstance(bounding_boxes[0], (list, tuple)):
             bounding_boxes = bounding_boxes[0]
+        if not bounding_boxes:
+            return
 
-        if not self._bounding_box and len(bounding_boxes) >= 1:
-            self._bounding_box = copy.deepcopy(bounding_boxes[0]._bounding_box)
+        if not self._coords:
+            self._set(bounding_boxes[0].bounding_box)
 
+        x1, y1, x2, y2 = self._coords
         for bounding_box in bounding_boxes:
-            self._bounding_box[0].x = min(self[0], bounding_box[0])
-            self._bounding_box[0].y = min(self[1], bounding_box[1])
-            self._bounding_box[1].x = max(self[2], bounding_box[2])
-            self._bounding_box[1].y = max(self[3], bounding_box[3])
+            x1 = min(x1, bounding_box[0])
+            y1 = min(y1, bounding_box[1])
+            x2 = max(x2, bounding_box[2])
+            y2 = max(y2, bounding_box[3])
+        self._set([x1, y1, x2, y2])
 
     def offset_x(self, *value):
         if len(value) == 1:
@@ -179,7 +163,7 @@ class _BaseBoundingBox(object):
 
     @property
     def bounding_box(self) -> list:
-        return [*self.pos1, *self.pos2]
+        return list(self._coords)
 
     @property
     def box(self) -> list:
@@ -191,69 +175,74 @@ class _BaseBoundingBox(object):
 
     @property
     def polygon(self) -> list:
-        return [self.pos1, (self.x2, self.y1), self.pos2, (self.x1, self.y2)]
+        return list(self._polygon)
 
-    @property
+    @_cached
+    def _polygon(self) -> tuple:
+        x1, y1, x2, y2 = self._coords
+        return (x1, y1), (x2, y1), (x2, y2), (x1, y2)
+
+    @_cached
     def pos1(self) -> tuple:
-        return self._bounding_box[0].pos
+        return self._coords[0], self._coords[1]
 
-    @property
+    @_cached
     def pos2(self) -> tuple:
-        return self._bounding_box[1].pos
+        return self._coords[2], self._coords[3]
 
     @property
     def x1(self) -> int | float:
-        return self[0]
+        return self._coords[0]
 
     @x1.setter
     def x1(self, value: int | float):
-        self._bounding_box[0].x = value
+        self._setCoord(0, value)
 
     @property
     def x2(self) -> int | float:
-        return self[2]
+        return self._coords[2]
 
     @x2.setter
     def x2(self, value: int | float):
-        self._bounding_box[1].x = value
+        self._setCoord(2, value)
 
     @property
     def y1(self) -> int | float:
-        return self[1]
+        return self._coords[1]
 
     @y1.setter
     def y1(self, value: int | float):
-        self._bounding_box[0].y = value
+        self._setCoord(1, value)
 
     @property
     def y2(self) -> int | float:
-        return self[3]
+        return self._coords[3]
 
     @y2.setter
     def y2(self, value: int | float):
-        self._bounding_box[1].y = value
+        self._setCoord(3, value)
 
-    @property
+    @_cached
     def area(self) -> int | float:
         return self.width * self.height
 
-    @property
+    @_cached
     def width(self) -> int | float:
-        return self.x2 - self.x1
+        return self._coords[2] - self._coords[0]
 
-    @property
+    @_cached
     def height(self) -> int | float:
-        return self.y2 - self.y1
+        return self._coords[3] - self._coords[1]
 
-    @property
+    @_cached
     def centre_x(self) -> int | float:
-        return self.x2 - (self.width / 2)
+        return self._coords[2] - (self.width / 2)
 
-    @property
+    @_cached
     def centre_y(self) -> int | float:
-        return self.y2 - (self.height / 2)
+        return self._coords[3] - (self.height / 2)
 
-    @property
+    @_cached
     def centre_pos(self) -> tuple:
         return self.centre_x, self.centre_y
 
@@ -303,6 +292,7 @@ class BoundingBox2(_BaseBoundingBox):
         return x_percentage, y_percentage
 
     def toShapelyPolygon(self) -> Polygon:
+        from shapely import Polygon
         return Polygon(self.polygon)
 
 
@@ -400,7 +390,7 @@ class BoundingBox(_BaseBoundingBox):
 
     def __eq__(self, other):
         if isinstance(other, BoundingBox):
-            if self._bounding_box == other._bounding_box:
+            if self._coords == other._coords:
                 return True
         return False
 
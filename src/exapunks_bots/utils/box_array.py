@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import numpy as np
+
+from .bounding_box import BoundingBox
+
+
+def toArray(boxes: list | tuple | np.ndarray) -> np.ndarray:
+    """
+    Convert bounding boxes into an array of rows (x1, y1, x2, y2).
+
+    :param boxes: Bounding boxes or rows of coordinates, should be a list[BoundingBox] |
+     tuple[BoundingBox] | ndarray[N, 4]
+    :return: array - ndarray[N, 4]
+    """
+    if isinstance(boxes, np.ndarray):
+        return boxes.reshape(-1, 4).astype(np.float64, copy=False)
+    return np.array([box.bounding_box if hasattr(box, 'bounding_box') else box for box in boxes],
+                    dtype=np.float64).reshape(-1, 4)
+
+
+def fromArray(array: np.ndarray, cls: type = BoundingBox) -> list:
+    """
+    Convert an array of rows (x1, y1, x2, y2) into bounding boxes.
+
+    :param array: Rows of coordinates, should be a ndarray[N, 4]
+    :param cls: Bounding box class to be created, should be a type
+    :return: boxes - list[BoundingBox]
+    """
+    return [cls(*row) for row in np.asarray(array).reshape(-1, 4).tolist()]
+
+
+def areas(boxes: list | tuple | np.ndarray) -> np.ndarray:
+    """Area of each bounding box"""
+    boxes = toArray(boxes)
+    return (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+
+
+def overlaps(a: list | tuple | np.ndarray, b: list | tuple | np.ndarray) -> tuple:
+    """
+    Pairwise x and y overlaps of the bounding boxes, negative overlaps
+    are taken as 0.
+
+    :param a: First bounding boxes, should be a list[BoundingBox] | ndarray[N, 4]
+    :param b: Second bounding boxes, should be a list[BoundingBox] | ndarray[M, 4]
+    :return: x_overlap, y_overlap - tuple[ndarray[N, M], ndarray[N, M]]
+    """
+    a, b = toArray(a)[:, np.newaxis], toArray(b)[np.newaxis]
+    x_overlap = np.maximum(np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]), 0)
+    y_overlap = np.maximum(np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]), 0)
+    return x_overlap, y_overlap
+
+
+def decimalOverlap(a: list | tuple | np.ndarray, b: list | tuple | np.ndarray) -> tuple:
+    """
+    Pairwise BoundingBox.getDecimalOverlap, the overlaps as a fraction of
+    the minimum area, width and height.
+
+    :param a: First bounding boxes, should be a list[BoundingBox] | ndarray[N, 4]
+    :param b: Second bounding boxes, should be a list[BoundingBox] | ndarray[M, 4]
+    :return: area_overlap, x_overlap, y_overlap - tuple[ndarray[N, M], ndarray[N, M], ndarray[N, M]]
+    """
+    a, b = toArray(a), toArray(b)
+    x_overlap, y_overlap = overlaps(a, b)
+    min_area = np.minimum(areas(a)[:, np.newaxis], areas(b)[np.newaxis])
+    min_width = np.minimum((a[:, 2] - a[:, 0])[:, np.newaxis], (b[:, 2] - b[:, 0])[np.newaxis])
+    min_height = np.minimum((a[:, 3] - a[:, 1])[:, np.newaxis], (b[:, 3] - b[:, 1])[np.newaxis])
+
+    valid = min_area != 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (np.where(valid, x_overlap * y_overlap / min_area, 0.),
+                np.where(valid, x_overlap / min_width, 0.),
+                np.where(valid, y_overlap / min_height, 0.))
+
+
+def iou(a: list | tuple | np.ndarray, b: list | tuple | np.ndarray) -> np.ndarray:
+    """
+    Pairwise intersection over union of the bounding boxes.
+
+    :param a: First bounding boxes, should be a list[BoundingBox] | ndarray[N, 4]
+    :param b: Second bounding boxes, should be a list[BoundingBox] | ndarray[M, 4]
+    :return: iou - ndarray[N, M]
+    """
+    a, b = toArray(a), toArray(b)
+    x_overlap, y_overlap = overlaps(a, b)
+    intersection = x_overlap * y_overlap
+    union = areas(a)[:, np.newaxis] + areas(b)[np.newaxis] - intersection
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(union > 0, intersection / union, 0.)
+
+
+def clip(boxes: list | tuple | np.ndarray, roi: BoundingBox | list | tuple, drop_empty: bool = True) -> np.ndarray:
+    """
+    Clip the bounding boxes to the region of interest.
+
+    :param boxes: Bounding boxes, should be a list[BoundingBox] | ndarray[N, 4]
+    :param roi: Region of interest, should be a BoundingBox | list[int | float] | tuple[int | float]
+    :param drop_empty: Whether to drop boxes outside the region, should be a bool
+    :return: clipped - ndarray[N, 4]
+    """
+    x1, y1, x2, y2 = roi.bounding_box if hasattr(roi, 'bounding_box') else roi
+    clipped = toArray(boxes).copy()
+    np.clip(clipped[:, 0::2], x1, x2, out=clipped[:, 0::2])
+    np.clip(clipped[:, 1::2], y1, y2, out=clipped[:, 1::2])
+    if drop_empty:
+        clipped = clipped[(clipped[:, 2] > clipped[:, 0]) & (clipped[:, 3] > clipped[:, 1])]
+    return clipped
+
+
+def unionArea(boxes: list | tuple | np.ndarray) -> float:
+    """
+    Area covered by the union of the bounding boxes, found exactly on the
+    grid of their compressed edge coordinates.
+
+    :param boxes: Bounding boxes, should be a list[BoundingBox] | ndarray[N, 4]
+    :return: area - float
+    """
+    boxes = toArray(boxes)
+    boxes = boxes[(boxes[:, 2] > boxes[:, 0]) & (boxes[:, 3] > boxes[:, 1])]
+    if not len(boxes):
+        return 0.
+    xs, x_index = np.unique(boxes[:, 0::2], return_inverse=True)
+    ys, y_index = np.unique(boxes[:, 1::2], return_inverse=True)
+    x_index, y_index = x_index.reshape(-1, 2), y_index.reshape(-1, 2)
+
+    coverage = np.zeros((len(ys), len(xs)), dtype=np.int32)
+    np.add.at(coverage, (y_index[:, 0], x_index[:, 0]), 1)
+    np.add.at(coverage, (y_index[:, 0], x_index[:, 1]), -1)
+    np.add.at(coverage, (y_index[:, 1], x_index[:, 0]), -1)
+    np.add.at(coverage, (y_index[:, 1], x_index[:, 1]), 1)
+    covered = coverage.cumsum(axis=0).cumsum(axis=1)[:-1, :-1] > 0
+    return float(np.diff(ys) @ covered @ np.diff(xs))
+
+
+def coverageMask(boxes: list | tuple | np.ndarray, region: BoundingBox | list | tuple) -> np.ndarray:
+    """
+    Pixel mask of the region covered by any of the bounding boxes, box
+    edges are rounded to whole pixels.
+
+    :param boxes: Bounding boxes, should be a list[BoundingBox] | ndarray[N, 4]
+    :param region: Region of the mask, should be a BoundingBox | list[int | float] | tuple[int | float]
+    :return: mask - ndarray[H, W]
+    """
+    x1, y1, x2, y2 = (int(round(value)) for value in
+                      (region.bounding_box if hasattr(region, 'bounding_box') else region))
+    boxes = np.rint(clip(boxes, (x1, y1, x2, y2))).astype(np.intp) - [x1, y1, x1, y1]
+
+    coverage = np.zeros((y2 - y1 + 1, x2 - x1 + 1), dtype=np.int32)
+    np.add.at(coverage, (boxes[:, 1], boxes[:, 0]), 1)
+    np.add.at(coverage, (boxes[:, 1], boxes[:, 2]), -1)
+    np.add.at(coverage, (boxes[:, 3], boxes[:, 0]), -1)
+    np.add.at(coverage, (boxes[:, 3], boxes[:, 2]), 1)
+    return coverage.cumsum(axis=0).cumsum(axis=1)[:-1, :-1] > 0
+
+
+def toPolygons(boxes: list | tuple | np.ndarray) -> np.ndarray:
+    """
+    Create the shapely polygons of the bounding boxes in one call.
+
+    :param boxes: Bounding boxes, should be a list[BoundingBox] | ndarray[N, 4]
+    :return: polygons - ndarray[N] of shapely.Polygon
+    """
+    import shapely
+
+    boxes = toArray(boxes)
+    return shapely.box(boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3])
+
+
+def union(boxes: list | tuple | np.ndarray):
+    """Shapely geometry of the union of the bounding boxes"""
+    import shapely
+
+    return shapely.union_all(toPolygons(boxes))
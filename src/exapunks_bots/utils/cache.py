@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import atexit
+import collections
+import functools
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable
+
+_logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class _KwargsMark(object):
+    """Separates the positional and keyword arguments of memoize keys"""
+    def __reduce__(self) -> str:
+        return '_KWARGS_MARK'  # Unpickles to the same object, so saved keys still match
+
+    def __repr__(self) -> str:
+        return '<kwargs>'
+
+
+_KWARGS_MARK = _KwargsMark()
+
+
+def _registerKwargsMark() -> None:
+    """Allow memoize keys to be saved with the '.exb' codec"""
+    from . import codec  # codec imports config, which imports utils and this module
+
+    codec.register('memoize.kwargs', _KwargsMark, lambda mark: None, lambda state: _KWARGS_MARK)
+
+
+def sizeOf(value: Any) -> int:
+    """
+    Approximate memory size of a value in bytes, following the items of
+    containers and the buffers of arrays.
+
+    :param value: Value to be measured, should be an Any
+    :return: size - int
+    """
+    nbytes = getattr(value, 'nbytes', None)
+    if isinstance(nbytes, int):
+        return nbytes
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(sizeOf(key) + sizeOf(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(sizeOf(item) for item in value)
+    return size
+
+
+class Cache(object):
+    def __init__(self, max_entries: int = 128, max_bytes: int = None, ttl: float = None, path: str = None,
+                 name: str = 'cache'):
+        """
+        Thread-safe mapping evicting the least recently used entries when
+        over the entry-count or memory-size limit, and dropping entries
+        older than the time to live.
+
+        :param max_entries: Maximum number of entries, unbounded if None, should be an int
+        :param max_bytes: Maximum approximate size of the values in bytes, unbounded if None, should be an int
+        :param ttl: Seconds an entry is kept after being set, forever if None, should be a float
+        :param path: '.pkl' or '.exb' file the entries are loaded from and saved to at exit, should be a str
+        :param name: Name of the cache in logs, should be a str
+        """
+        if max_entries is not None and max_entries < 1:
+            raise ValueError(f"'max_entries' must be at least 1, got: {max_entries}")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.path = path
+        self.name = name
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.bytes = 0
+        self._entries = collections.OrderedDict()  # key: (value, expiry time, size)
+        self._lock = threading.Lock()
+
+        if path is not None:
+            self.load()
+            atexit.register(self.save)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Any) -> bool:
+        return self.get(key, _MISSING, count=False) is not _MISSING
+
+    def get(self, key: Any, default: Any = None, count: bool = True) -> Any:
+        """
+        Get the value of the key, marking it as most recently used.
+
+        :param key: Key of the entry, should be a Hashable
+        :param default: Value returned when the key is missing or expired, should be an Any
+        :param count: Whether to count the access in the hit and miss stats, should be a bool
+        :return: value - Any
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] is not None and entry[1] <= time.monotonic():
+                self._pop(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += int(count)
+                return default
+            self._entries.move_to_end(key)
+            self.hits += int(count)
+            return entry[0]
+
+    def set(self, key: Any, value: Any, ttl: float = None) -> None:
+        """
+        Set the value of the key, evicting the least recently used entries
+        when over the limits.
+
+        :param key: Key of the entry, should be a Hashable
+        :param value: Value of the entry, should be an Any
+        :param ttl: Seconds the entry is kept, the cache's ttl if None, should be a float
+        """
+        ttl = self.ttl if ttl is None else ttl
+        size = sizeOf(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            _logger.debug(f"Cache '{self.name}': value of {size} bytes exceeds the limit, not cached")
+            return
+        with self._lock:
+            if key in self._entries:
+                self._pop(key)
+            self._entries[key] = (value, None if ttl is None else time.monotonic() + ttl, size)
+            self.bytes += size
+            while ((self.max_entries is not None and len(self._entries) > self.max_entries)
+                   or (self.max_bytes is not None and self.bytes > self.max_bytes)):
+                self._pop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _pop(self, key: Any) -> None:
+        self.bytes -= self._entries.pop(key)[2]
+
+    def clear(self) -> None:
+        """Remove every entry and reset the stats"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.expirations = self.bytes = 0
+
+    @property
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'entries': len(self._entries),
+                'bytes': self.bytes}
+
+    def save(self, path: str = None) -> bool:
+        """
+        Save the unexpired entries with utils.save, in least recently used
+        order, keeping their remaining time to live.
+
+        :param path: File of the entries, the cache's path if None, should be a str
+        :return: completed - bool
+        """
+        from .utils import makePath, save  # utils imports this module
+
+        _registerKwargsMark()
+        path = self.path if path is None else path
+        if path is None:
+            raise ValueError(f"Cache '{self.name}' has no path to save to")
+        now = time.monotonic()
+        with self._lock:
+            entries = [(key, value, None if expiry is None else expiry - now)
+                       for key, (value, expiry, _) in self._entries.items() if expiry is None or expiry > now]
+        dir_, name = os.path.split(os.path.abspath(path))
+        makePath(dir_)
+        return save(dir_, name, {'saved': time.time(), 'entries': entries}, errors='warn')
+
+    def load(self, path: str = None) -> int:
+        """
+        Load the entries saved with save(), dropping those that expired
+        while saved.
+
+        :param path: File of the entries, the cache's path if None, should be a str
+        :return: loaded - int
+        """
+        from .utils import load  # utils imports this module
+
+        _registerKwargsMark()
+        path = self.path if path is None else path
+        if path is None:
+            raise ValueError(f"Cache '{self.name}' has no path to load from")
+        data = load(*os.path.split(os.path.abspath(path)), errors='ignore')
+        if not data:
+            return 0
+        elapsed = time.time() - data['saved']
+        loaded = 0
+        for key, value, ttl in data['entries']:
+            if ttl is None or ttl > elapsed:
+                self.set(key, value, ttl=None if ttl is None else ttl - elapsed)
+                loaded += 1
+        _logger.debug(f"Cache '{self.name}': loaded {loaded} entries from '{path}'")
+        return loaded
+
+
+def memoize(max_entries: int = 128, max_bytes: int = None, ttl: float = None, path: str = None) -> Callable:
+    """
+    Decorator caching the results of a pure function by its arguments.
+    Calls with unhashable arguments are not cached. The cache is exposed
+    as the 'cache' attribute of the decorated function.
+
+    :param max_entries: Maximum number of results, unbounded if None, should be an int
+    :param max_bytes: Maximum approximate size of the results in bytes, unbounded if None, should be an int
+    :param ttl: Seconds a result is kept, forever if None, should be a float
+    :param path: '.pkl' or '.exb' file the results are loaded from and saved to at exit, should be a str
+    :return: decorator - Callable
+    """
+    def decorator(func: Callable) -> Callable:
+        cache = Cache(max_entries=max_entries, max_bytes=max_bytes, ttl=ttl, path=path, name=func.__qualname__)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = args + (_KWARGS_MARK,) + tuple(sorted(kwargs.items())) if kwargs else args
+            try:
+                value = cache.get(key, _MISSING)
+            except TypeError:  # Unhashable arguments
+                return func(*args, **kwargs)
+            if value is _MISSING:
+                value = func(*args, **kwargs)
+                cache.set(key, value)
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
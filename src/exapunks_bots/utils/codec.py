@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import struct
+from typing import Any, BinaryIO, Callable
+
+from .bounding_box import BoundingBox, BoundingBox2
+from .config import Config
+from .point import Point
+
+MAGIC = b'EXB\x00'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sH')
+_COUNT = struct.Struct('<I')
+_INT = struct.Struct('<q')
+_FLOAT = struct.Struct('<d')
+
+(_NONE, _FALSE, _TRUE, _INT_TAG, _BIG_INT, _FLOAT_TAG, _STR, _BYTES, _LIST, _TUPLE, _DICT,
+ _POINT, _BOUNDING_BOX, _BOUNDING_BOX2, _COLLECTION, _NDARRAY, _CONFIG, _EXTENSION, _TUPLE_COLLECTION) = range(19)
+
+# Package geometry types: tag, number of values per object
+_GEOMETRY = {Point: (_POINT, 2), BoundingBox: (_BOUNDING_BOX, 4), BoundingBox2: (_BOUNDING_BOX2, 4)}
+_GEOMETRY_TAGS = {tag: (cls, size) for cls, (tag, size) in _GEOMETRY.items()}
+
+# Registered type name: (class, encode, decode)
+_EXTENSIONS = {}
+_EXTENSION_NAMES = {}
+
+
+def register(name: str, cls: type, encode: Callable, decode: Callable) -> None:
+    """
+    Register a type to be encoded by the codec, such as a game state.
+
+    :param name: Unique and stable name of the type within files, should be a str
+    :param cls: Type to be registered, should be a type
+    :param encode: Converts an object into codec supported values, should be a Callable[[Any], Any]
+    :param decode: Rebuilds an object from the decoded values, should be a Callable[[Any], Any]
+    :return: - None
+    """
+    if name in _EXTENSIONS and _EXTENSIONS[name][0] is not cls:
+        raise ValueError(f"Codec type name '{name}' is already registered to '{_EXTENSIONS[name][0].__name__}'")
+    _EXTENSIONS[name] = (cls, encode, decode)
+    _EXTENSION_NAMES[cls] = name
+
+
+def _values(obj: Any) -> list:
+    return obj.bounding_box if isinstance(obj, (BoundingBox, BoundingBox2)) else list(obj.pos)
+
+
+def _isInt(value: Any) -> bool:
+    """Whether the number is an integer, including NumPy integers"""
+    return type(value) is int or (type(value) is not float and hasattr(type(value), '__index__'))
+
+
+def _packValues(values: list, out: list) -> None:
+    """
+    Pack numbers as int64 when all are integers, float64 when all are
+    floats, otherwise with the format of each number before the values.
+    """
+    codes = ['q' if _isInt(value) else 'd' for value in values]
+    if len(set(codes)) > 1:
+        out.append(b'm' + ''.join(codes).encode())
+        out.append(struct.pack(f"<{''.join(codes)}", *values))
+        return
+    code = codes[0] if codes else 'q'
+    out.append(code.encode())
+    out.append(struct.pack(f'<{len(values)}{code}', *values))
+
+
+def _encode(obj: Any, out: list) -> None:
+    cls = type(obj)
+    if obj is None:
+        out.append(bytes((_NONE,)))
+    elif cls is bool:
+        out.append(bytes((_TRUE if obj else _FALSE,)))
+    elif cls is int:
+        if -2 ** 63 <= obj < 2 ** 63:
+            out.append(bytes((_INT_TAG,)) + _INT.pack(obj))
+        else:
+            data = str(obj).encode()
+            out.append(bytes((_BIG_INT,)) + _COUNT.pack(len(data)) + data)
+    elif cls is float:
+        out.append(bytes((_FLOAT_TAG,)) + _FLOAT.pack(obj))
+    elif cls is str:
+        data = obj.encode('utf-8')
+        out.append(bytes((_STR,)) + _COUNT.pack(len(data)) + data)
+    elif cls in (bytes, bytearray):
+        out.append(bytes((_BYTES,)) + _COUNT.pack(len(obj)) + bytes(obj))
+    elif cls in (list, tuple):
+        item_cls = type(obj[0]) if obj else None
+        if item_cls in _GEOMETRY and all(type(item) is item_cls for item in obj):
+            tag = _COLLECTION if cls is list else _TUPLE_COLLECTION
+            out.append(bytes((tag, _GEOMETRY[item_cls][0])) + _COUNT.pack(len(obj)))
+            _packValues([value for item in obj for value in _values(item)], out)
+            return
+        out.append(bytes((_LIST if cls is list else _TUPLE,)) + _COUNT.pack(len(obj)))
+        for item in obj:
+            _encode(item, out)
+    elif cls is dict:
+        out.append(bytes((_DICT,)) + _COUNT.pack(len(obj)))
+        for key, value in obj.items():
+            _encode(key, out)
+            _encode(value, out)
+    elif cls in _GEOMETRY:
+        out.append(bytes((_GEOMETRY[cls][0],)))
+        _packValues(_values(obj), out)
+    elif cls is Config:
+        out.append(bytes((_CONFIG,)))
+        _encode(dict(obj.__dict__), out)
+    elif cls in _EXTENSION_NAMES:
+        name = _EXTENSION_NAMES[cls]
+        out.append(bytes((_EXTENSION,)))
+        _encode(name, out)
+        _encode(_EXTENSIONS[name][1](obj), out)
+    elif cls.__name__ == 'ndarray':
+        if obj.dtype.hasobject:
+            raise TypeError("Arrays of Python objects are not supported by the codec")
+        out.append(bytes((_NDARRAY,)))
+        _encode(obj.dtype.str, out)
+        _encode(tuple(obj.shape), out)
+        data = obj.tobytes()
+        out.append(_COUNT.pack(len(data)) + data)
+    elif cls.__module__ == 'numpy' and hasattr(obj, 'item'):  # NumPy scalars, e.g. float64
+        _encode(obj.item(), out)
+    else:
+        raise TypeError(f"Object of type '{cls.__name__}' is not supported by the codec")
+
+
+def _unpackValues(data: memoryview, offset: int, count: int) -> tuple:
+    code = chr(data[offset])
+    offset += 1
+    if code == 'm':
+        code = bytes(data[offset:offset + count]).decode('ascii')
+        if len(code) != count or set(code) - {'q', 'd'}:
+            raise ValueError(f"Invalid codec number formats at byte {offset}")
+        offset += count
+    elif code in ('q', 'd'):
+        code = f'{count}{code}'
+    else:
+        raise ValueError(f"Unknown codec number format '{code}' at byte {offset - 1}")
+    values = struct.unpack_from(f'<{code}', data, offset)
+    return values, offset + count * 8
+
+
+def _decode(data: memoryview, offset: int) -> tuple:
+    tag = data[offset]
+    offset += 1
+    if tag == _NONE:
+        return None, offset
+    if tag in (_FALSE, _TRUE):
+        return tag == _TRUE, offset
+    if tag == _INT_TAG:
+        return _INT.unpack_from(data, offset)[0], offset + 8
+    if tag == _FLOAT_TAG:
+        return _FLOAT.unpack_from(data, offset)[0], offset + 8
+    if tag in (_STR, _BYTES, _BIG_INT):
+        size = _COUNT.unpack_from(data, offset)[0]
+        offset += 4
+        value = bytes(data[offset:offset + size])
+        if tag == _STR:
+            value = value.decode('utf-8')
+        elif tag == _BIG_INT:
+            value = int(value)
+        return value, offset + size
+    if tag in (_LIST, _TUPLE):
+        count = _COUNT.unpack_from(data, offset)[0]
+        offset += 4
+        items = []
+        for _ in range(count):
+            item, offset = _decode(data, offset)
+            items.append(item)
+        return (items if tag == _LIST else tuple(items)), offset
+    if tag == _DICT:
+        count = _COUNT.unpack_from(data, offset)[0]
+        offset += 4
+        items = {}
+        for _ in range(count):
+            key, offset = _decode(data, offset)
+            items[key], offset = _decode(data, offset)
+        return items, offset
+    if tag in _GEOMETRY_TAGS:
+        cls, size = _GEOMETRY_TAGS[tag]
+        values, offset = _unpackValues(data, offset, size)
+        return cls(*values), offset
+    if tag in (_COLLECTION, _TUPLE_COLLECTION):
+        if data[offset] not in _GEOMETRY_TAGS:
+            raise ValueError(f"Unknown codec collection tag {data[offset]} at byte {offset}")
+        cls, size = _GEOMETRY_TAGS[data[offset]]
+        count = _COUNT.unpack_from(data, offset + 1)[0]
+        values, offset = _unpackValues(data, offset + 5, count * size)
+        items = [cls(*row) for row in zip(*[iter(values)] * size)]
+        return (items if tag == _COLLECTION else tuple(items)), offset
+    if tag == _CONFIG:
+        state, offset = _decode(data, offset)
+        config = Config.__new__(Config)
+        config.__dict__.update(state)
+        return config, offset
+    if tag == _EXTENSION:
+        name, offset = _decode(data, offset)
+        state, offset = _decode(data, offset)
+        if name not in _EXTENSIONS:
+            raise ValueError(f"Codec type '{name}' is not registered")
+        return _EXTENSIONS[name][2](state), offset
+    if tag == _NDARRAY:
+        import numpy as np
+
+        dtype, offset = _decode(data, offset)
+        shape, offset = _decode(data, offset)
+        size = _COUNT.unpack_from(data, offset)[0]
+        offset += 4
+        array = np.frombuffer(data[offset:offset + size], dtype=np.dtype(dtype)).reshape(shape).copy()
+        return array, offset + size
+    raise ValueError(f"Unknown codec tag {tag} at byte {offset - 1}")
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Encode the object with a versioned header. Supports None, bool, int,
+    float, str, bytes, list, tuple, dict, NumPy arrays and scalars, the
+    package's Point, BoundingBox, BoundingBox2 and Config, and registered
+    types. NumPy scalars are decoded as the equivalent Python value.
+
+    :param obj: Object to be encoded, should be an Any
+    :return: data - bytes
+    """
+    out = [_HEADER.pack(MAGIC, VERSION)]
+    _encode(obj, out)
+    return b''.join(out)
+
+
+def loads(data: bytes | bytearray | memoryview) -> Any:
+    """
+    Decode an object encoded by dumps. Only the supported types can be
+    created, so unlike pickle no code from the data is executed.
+
+    :param data: Encoded object, should be a bytes | bytearray | memoryview
+    :return: obj - Any
+    """
+    data = memoryview(data)
+    if len(data) < _HEADER.size:
+        raise ValueError("Data is too short to be encoded by the codec")
+    magic, version = _HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError(f"Data is not encoded by the codec, got header: {bytes(magic)}")
+    if version > VERSION:
+        raise ValueError(f"Codec version {version} is newer than the supported version {VERSION}")
+    try:
+        obj, offset = _decode(data, _HEADER.size)
+    except (IndexError, struct.error, UnicodeDecodeError) as e:
+        raise ValueError(f"Data is truncated or corrupt: {e}") from e
+    if offset != len(data):
+        raise ValueError(f"Unexpected {len(data) - offset} bytes after the encoded object")
+    return obj
+
+
+def dump(obj: Any, file: BinaryIO) -> None:
+    file.write(dumps(obj))
+
+
+def load(file: BinaryIO) -> Any:
+    return loads(file.read())
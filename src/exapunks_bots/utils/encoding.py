@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import json
+import math
+from typing import Any, TextIO
+
+from .bounding_box import BoundingBox, BoundingBox2
+from .point import Point
+from .utils import toJson
+
+try:
+    import orjson
+except ImportError:  # Optional, the json module is used instead
+    orjson = None
+
+TYPE_KEY = '__type__'
+
+# Tagged type name: (class, number of values per object)
+TYPES = {
+    'BoundingBox': (BoundingBox, 4),
+    'BoundingBox2': (BoundingBox2, 4),
+    'Point': (Point, 2),
+}
+
+
+def _values(obj: Any) -> list:
+    return obj.bounding_box if isinstance(obj, (BoundingBox, BoundingBox2)) else list(obj.pos)
+
+
+def encode(data: Any) -> Any:
+    """
+    Replace bounding boxes, points and arrays of the data with tagged flat
+    arrays of their coordinates. Collections of a single type are encoded
+    into one flat array, skipping a serializer callback per object.
+
+    :param data: Data to be encoded, should be an Any
+    :return: encoded - Any
+    """
+    if isinstance(data, dict):
+        return {key: encode(value) for key, value in data.items()}
+    if isinstance(data, (list, tuple)):
+        if data:
+            cls = type(data[0])
+            name = cls.__name__
+            if name in TYPES and TYPES[name][0] is cls and all(type(item) is cls for item in data):
+                return {TYPE_KEY: name, 'data': [value for item in data for value in _values(item)]}
+        return [encode(item) for item in data]
+    name = type(data).__name__
+    if name in TYPES and TYPES[name][0] is type(data):
+        return {TYPE_KEY: name, 'data': _values(data), 'single': True}
+    if name == 'ndarray':
+        return {TYPE_KEY: 'ndarray', 'dtype': data.dtype.str, 'shape': list(data.shape), 'data': data.ravel().tolist()}
+    return data
+
+
+def objectHook(obj: dict, as_array: bool = False) -> Any:
+    """
+    Rebuild tagged objects when decoding JSON.
+
+    :param obj: Decoded JSON object, should be a dict
+    :param as_array: Whether to return collections as an array of rows instead, should be a bool
+    :return: obj - Any
+    """
+    name = obj.get(TYPE_KEY)
+    if name is None:
+        return obj
+    if name == 'ndarray':
+        import numpy as np
+
+        return np.array(obj['data'], dtype=obj['dtype']).reshape(obj['shape'])
+    if name not in TYPES:
+        return obj
+
+    cls, size = TYPES[name]
+    data = obj['data']
+    if obj.get('single'):
+        return cls(*data)
+    if as_array:
+        import numpy as np
+
+        return np.array(data, dtype=np.float64).reshape(-1, size)
+    return [cls(*row) for row in zip(*[iter(data)] * size)]
+
+
+def _isFinite(data: Any) -> bool:
+    """Whether the encoded data holds no NaN or infinite floats"""
+    if isinstance(data, float):
+        return math.isfinite(data)
+    if isinstance(data, dict):
+        return all(map(_isFinite, data)) and all(map(_isFinite, data.values()))
+    if isinstance(data, (list, tuple)):
+        return all(map(_isFinite, data))
+    return True
+
+
+def dumps(data: Any, compact: bool = True, indent: int = 4) -> str:
+    """
+    Serialize the data to JSON, using orjson when installed and compact.
+    Either way non-str keys are written as strings and non-ASCII text is
+    written unescaped, while floats may be formatted differently, e.g.
+    1e-07 by json and 1e-7 by orjson, which load as the same values. As
+    orjson writes NaN and infinity as null, data holding them is
+    serialized with json, which writes them as NaN and Infinity.
+
+    :param data: Data to be serialized, should be an Any
+    :param compact: Whether to exclude whitespace, should be a bool
+    :param indent: Indentation when not compact, should be an int
+    :return: encoded - str
+    """
+    data = encode(data)
+    if compact and orjson is not None and _isFinite(data):
+        return orjson.dumps(data, default=toJson, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    if compact:
+        return json.dumps(data, default=toJson, separators=(',', ':'), ensure_ascii=False)
+    return json.dumps(data, default=toJson, indent=indent)
+
+
+def dump(data: Any, file: TextIO, compact: bool = True, indent: int = 4) -> None:
+    file.write(dumps(data, compact=compact, indent=indent))
+
+
+def loads(data: str | bytes, as_array: bool = False) -> Any:
+    """
+    Deserialize JSON, rebuilding tagged bounding boxes, points and arrays.
+
+    :param data: JSON document, should be a str | bytes
+    :param as_array: Whether to return collections as an array of rows instead, should be a bool
+    :return: decoded - Any
+    """
+    return json.loads(data, object_hook=lambda obj: objectHook(obj, as_array=as_array))
+
+
+def load(file: TextIO, as_array: bool = False) -> Any:
+    return loads(file.read(), as_array=as_array)
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import importlib
+import sys
+
+
+def lazyAttrs(package: str, attrs: dict) -> tuple:
+    """
+    Create the module __getattr__ and __dir__ of a package whose
+    attributes are imported from their modules on first access.
+
+    :param package: Name of the package, should be a str
+    :param attrs: Attribute names and their modules, relative to the package, should be a dict[str: str]
+    :return: __getattr__, __dir__ - tuple[Callable, Callable]
+    """
+    def __getattr__(name: str):
+        if name not in attrs:
+            raise AttributeError(f"module '{package}' has no attribute '{name}'")
+        value = getattr(importlib.import_module(attrs[name], package), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> list:
+        return sorted(set(vars(sys.modules[package])) | set(attrs))
+
+    return __getattr__, __dir__
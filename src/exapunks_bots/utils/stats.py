@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import math
+
+
+def percentile(values: list | tuple, q: float) -> float:
+    """
+    Calculate the q-th percentile with linear interpolation between the
+    closest ranks.
+
+    :param values: Sampled values, should be a list[int | float] | tuple[int | float]
+    :param q: Percentile within 0 and 100, should be a float
+    :return: value - float
+    """
+    if not 0 <= q <= 100:
+        raise ValueError(f"'q' must be within range of 0 and 100, got: {q}")
+    if not values:
+        return 0.
+
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    lower, upper = math.floor(rank), math.ceil(rank)
+    if lower == upper:
+        return float(ordered[lower])
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarise(values: list | tuple, percentiles: tuple = (50, 90, 95, 99)) -> dict:
+    """
+    Summarise sampled values, commonly latencies in seconds.
+
+    :param values: Sampled values, should be a list[int | float] | tuple[int | float]
+    :param percentiles: Percentiles to include, should be a tuple[int | float]
+    :return: summary - dict[str: int | float]
+    """
+    summary = {'count': len(values),
+               'mean': sum(values) / len(values) if values else 0.,
+               'min': min(values) if values else 0.,
+               'max': max(values) if values else 0.}
+    for q in percentiles:
+        summary[f'p{q}'] = percentile(values, q)
+    return summary
@@ -1,16 +1,49 @@
 from __future__ import annotations
 
-import inspect
+import functools
 import json
 import logging
 import os
 import pickle
 import re
-from typing import Any
+from typing import Any, Callable
 
 _logger = logging.getLogger(__name__)
 
 
+def _lruCache(maxsize: int = 1024) -> Callable:
+    """
+    functools.lru_cache that calls the function uncached when its arguments
+    are unhashable, e.g. joinPath('a', ['b']), as memoize does.
+
+    The path and name helpers are only bounded by their number of entries,
+    which lru_cache does with less overhead per call than the package's
+    Cache. Cache and memoize are kept for results that also need a memory
+    bound, expiry or persistence, such as the card templates.
+
+    :param maxsize: Maximum number of results, should be an int
+    :return: decorator - Callable
+    """
+    def decorator(func: Callable) -> Callable:
+        cached = functools.lru_cache(maxsize=maxsize)(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return cached(*args, **kwargs)
+            except TypeError:
+                try:
+                    hash((args, tuple(kwargs.items())))
+                except TypeError:  # Unhashable arguments
+                    return func(*args, **kwargs)
+                raise
+
+        wrapper.cache_info, wrapper.cache_clear = cached.cache_info, cached.cache_clear
+        return wrapper
+    return decorator
+
+
+@_lruCache(maxsize=1024)
 def camelToSnake(value: str) -> str:
     """Convert CamelCase to snake_case"""
     return re.sub(r'(?<!^)(?=[A-Z])', '_', value).lower()
@@ -62,6 +95,7 @@ def existPath(path: str, *paths, ext: str = '', errors: str = 'ignore') -> bool:
     return exist
 
 
+@_lruCache(maxsize=1024)
 def joinPath(path: str, *paths, ext: str = '') -> str:
     """
     Join the paths together, adds an extension if not already included
@@ -131,6 +165,7 @@ def listPath(path: str, *paths, ext: str | list | tuple = None, return_file_path
     return path, files
 
 
+@_lruCache(maxsize=1024)
 def splitPath(path: str, direction: str = 'lr', max_split: int = 1, include_ext: bool = True) -> tuple:
     """
     Splits the path into left and right by direction with split size.
@@ -157,6 +192,7 @@ def splitPath(path: str, direction: str = 'lr', max_split: int = 1, include_ext:
     return os.sep.join(left), os.sep.join(right)
 
 
+@_lruCache(maxsize=1024)
 def getLastPath(path: str, include_ext: bool = True) -> str:
     """
     Splits the last path from the given path and includes the option
@@ -177,6 +213,8 @@ def getRelativePath(*paths, ext: str = ''):
     :param ext: File extension, should be a str
     :return: path - str
     """
+    import inspect  # Slow to import and rarely needed
+
     callback_path = inspect.stack()[1].filename
     relative_path = ''
     if os.name == 'nt':
@@ -244,23 +282,20 @@ def getDictKeys(array: dict, dict_keys: list = None) -> list:
     return dict_keys
 
 
-def update(obj: object, kwargs: dict, errors='ignore') -> object:
-    """
-    Update the objects attributes, if given attributes are present
-    in object and match existing data types.
+# Whether update() may set an attribute to a value, by (attribute type, value type)
+_TYPE_MATCHES = {}
+_MISSING = object()
 
-    :param obj: The object that is being updated, should be an object
-    :param kwargs: Keywords and values to be updated, should be a dict
-    :param errors: Whether to 'ignore', 'warn' or 'raise' errors, should be str
-    :return: obj - object
-    """
-    if errors not in ["ignore", "warn", "raise"]:
-        raise ValueError("The parameter errors must be either 'ignore', 'warn' or 'raise'")
 
-    kwargs = dict(zip(map(camelToSnake, list(kwargs.keys())), list(kwargs.values())))
+def _compileKeys(kwargs: dict) -> dict:
+    """Convert the keys to snake_case, camelToSnake caches each conversion"""
+    return {camelToSnake(key): value for key, value in kwargs.items()}
 
+
+def _update(obj: object, kwargs: dict, errors: str) -> object:
     for key, value in kwargs.items():
-        if not hasattr(obj, key):
+        attr = getattr(obj, key, _MISSING)
+        if attr is _MISSING:
             msg = f"'{obj.__class__.__name__}' object has no attribute '{key}'"
             _logger.debug(msg)
             if errors == 'warn':
@@ -268,12 +303,16 @@ def update(obj: object, kwargs: dict, errors='ignore') -> object:
             elif errors == 'raise':
                 raise AttributeError(msg)
             continue
-        attr_ = getattr(obj, key)
-        if isinstance(value, type(attr_)) or (type(attr_).__name__ == type(value).__name__):
+        attr_type, value_type = type(attr), type(value)
+        match = _TYPE_MATCHES.get((attr_type, value_type))
+        if match is None:
+            match = _TYPE_MATCHES[(attr_type, value_type)] = (issubclass(value_type, attr_type)
+                                                              or attr_type.__name__ == value_type.__name__)
+        if match:
             setattr(obj, key, value)
             continue
 
-        msg = f"'{key}': Expected type '{type(attr_).__name__}', got '{type(value).__name__}'"
+        msg = f"'{key}': Expected type '{attr_type.__name__}', got '{value_type.__name__}'"
         _logger.debug(msg)
         if errors == 'warn':
             _logger.warning(msg)
@@ -282,6 +321,43 @@ def update(obj: object, kwargs: dict, errors='ignore') -> object:
     return obj
 
 
+def update(obj: object, kwargs: dict, errors='ignore') -> object:
+    """
+    Update the objects attributes, if given attributes are present
+    in object and match existing data types.
+
+    :param obj: The object that is being updated, should be an object
+    :param kwargs: Keywords and values to be updated, should be a dict
+    :param errors: Whether to 'ignore', 'warn' or 'raise' errors, should be str
+    :return: obj - object
+    """
+    if errors not in ["ignore", "warn", "raise"]:
+        raise ValueError("The parameter errors must be either 'ignore', 'warn' or 'raise'")
+
+    return _update(obj, _compileKeys(kwargs), errors)
+
+
+def updateMany(objs: list | tuple, payloads: dict | list | tuple, errors='ignore') -> list:
+    """
+    Update the attributes of many objects, either with a payload each or
+    with the same payload, whose keys are then only converted once.
+
+    :param objs: The objects that are being updated, should be a list[object] | tuple[object]
+    :param payloads: Keywords and values to be updated, should be a dict | list[dict] | tuple[dict]
+    :param errors: Whether to 'ignore', 'warn' or 'raise' errors, should be str
+    :return: objs - list[object]
+    """
+    if errors not in ["ignore", "warn", "raise"]:
+        raise ValueError("The parameter errors must be either 'ignore', 'warn' or 'raise'")
+
+    if isinstance(payloads, dict):
+        kwargs = _compileKeys(payloads)
+        return [_update(obj, kwargs, errors) for obj in objs]
+    if len(objs) != len(payloads):
+        raise ValueError(f"Expected a payload per object, got {len(payloads)} payloads for {len(objs)} objects")
+    return [_update(obj, _compileKeys(kwargs), errors) for obj, kwargs in zip(objs, payloads)]
+
+
 def toJson(obj: object, errors='raise') -> Any:
     """
     Serializer method will return the JSON representation of the object.
@@ -319,7 +395,10 @@ def toJson(obj: object, errors='raise') -> Any:
 def load(dir_: str, name: str, ext: str = '', errors: str = 'raise') -> Any:
     """
     Load the data with appropriate method. Pickle will deserialise the
-    contents of the file and json will load the contents.
+    contents of the file and json will load the contents, rebuilding
+    bounding boxes and points saved in compact form. The '.exb' binary
+    codec only rebuilds the package's own and basic types, so is safe
+    for files shared between machines.
 
     :param dir_: Directory of file, should be a str
     :param name: Name of file, should be a str
@@ -348,11 +427,18 @@ def load(dir_: str, name: str, ext: str = '', errors: str = 'raise') -> Any:
         return None
 
     if ext == '.json':
+        from . import encoding
+
         with open(path, 'r', encoding='utf-8') as file:
-            data = json.load(file)
+            data = json.load(file, object_hook=encoding.objectHook)
     elif ext == '.txt':
         with open(path, 'r') as file:
             data = file.read()
+    elif ext == '.exb':
+        from . import codec
+
+        with open(path, 'rb') as file:
+            data = codec.load(file)
     else:
         with open(path, 'rb') as file:
             data = pickle.load(file)
@@ -360,16 +446,20 @@ def load(dir_: str, name: str, ext: str = '', errors: str = 'raise') -> Any:
     return data
 
 
-def save(dir_: str, name: str, data: Any, indent: int = 4, errors: str = 'raise') -> bool:
+def save(dir_: str, name: str, data: Any, indent: int = 4, compact: bool = False, errors: str = 'raise') -> bool:
     """
     Save the data with appropriate method. Pickle will serialise the
     object, while json will dump the data with indenting to allow users
-    to edit and easily view the encoded data.
+    to edit and easily view the encoded data. Compact json instead
+    writes bounding boxes and points as flat coordinate arrays without
+    whitespace, which is much faster for large collections. The '.exb'
+    binary codec encodes basic and the package's own types.
 
     :param dir_: Directory of file, should be a str
     :param name: Name of file, should be a str
     :param data: Data to be saved, should be an Any
     :param indent: Data's indentation within the file, should be an int
+    :param compact: Whether to save json in the compact form, should be a bool
     :param errors: If 'ignore', suppress errors, should be str
     :return: completed - bool
     """
@@ -391,12 +481,22 @@ def save(dir_: str, name: str, data: Any, indent: int = 4, errors: str = 'raise'
             raise ValueError(msg)
         return False
 
-    if ext == '.json':
+    if ext == '.json' and compact:
+        from . import encoding
+
+        with open(path, 'w', encoding='utf-8') as file:
+            encoding.dump(data, file)
+    elif ext == '.json':
         with open(path, 'w', encoding='utf-8') as file:
             json.dump(data, file, default=toJson, indent=indent)
     elif ext == '.txt':
         with open(path, 'w') as file:
             file.write(str(data))
+    elif ext == '.exb':
+        from . import codec
+
+        with open(path, 'wb') as file:
+            codec.dump(data, file)
     elif isinstance(data, object):
         with open(path, 'wb') as file:
             pickle.dump(data, file, pickle.HIGHEST_PROTOCOL)
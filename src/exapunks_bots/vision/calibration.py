@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import logging
+from typing import Callable
+
+import numpy as np
+
+from ..utils import BoundingBox, utils
+
+_logger = logging.getLogger(__name__)
+
+COLUMNS = 9
+DEFAULT_DPI = 96
+
+
+def dominantColour(frame: np.ndarray, step: int = 4) -> tuple:
+    """
+    Find the most common colour of the frame from a sparse sample of
+    coarsely quantised pixels.
+
+    :param frame: Captured frame, should be a ndarray[H, W, C] | ndarray[H, W]
+    :param step: Sampling stride in pixels, should be an int
+    :return: colour - tuple[float]
+    """
+    pixels = _channels(frame)[::step, ::step]
+    pixels = pixels.reshape(-1, pixels.shape[2])
+    quantised = (pixels // 16).astype(np.int32)
+    codes = np.zeros(len(pixels), dtype=np.int32)
+    for channel in range(quantised.shape[1]):
+        codes = codes * 16 + quantised[:, channel]
+    values, counts = np.unique(codes, return_counts=True)
+    return tuple(pixels[codes == values[counts.argmax()]].mean(axis=0).tolist())
+
+
+def locateBoard(frame: np.ndarray, colour: tuple = None, tolerance: int = 24, min_fraction: float = 0.1,
+                columns: int = COLUMNS) -> BoardLayout | None:
+    """
+    Search the full frame for the board, the largest block of rows and
+    columns mostly matching the board colour, then split it into column
+    regions of interest.
+
+    :param frame: Captured frame of the game window, should be a ndarray[H, W, C] | ndarray[H, W]
+    :param colour: Board colour, the dominant colour if None, should be a tuple[int]
+    :param tolerance: Maximum channel difference to the board colour, should be an int
+    :param min_fraction: Minimum fraction of board coloured pixels per row and column, should be a float
+    :param columns: Number of card columns, should be an int
+    :return: layout - BoardLayout | None
+    """
+    frame = _channels(frame)
+    colour = dominantColour(frame) if colour is None else colour
+    mask = np.all(np.abs(frame.astype(np.int16) - np.asarray(colour, dtype=np.int16)) <= tolerance, axis=-1)
+
+    rows = _longestRun(mask.mean(axis=1) >= min_fraction)
+    if rows is None:
+        _logger.debug("Board was not found, no rows match the board colour")
+        return None
+    cols = _longestRun(mask[rows[0]:rows[1]].mean(axis=0) >= min_fraction)
+    if cols is None:
+        _logger.debug("Board was not found, no columns match the board colour")
+        return None
+
+    board = BoundingBox(cols[0], rows[0], cols[1], rows[1])
+    step = board.width / columns
+    column_boxes = [BoundingBox(round(board.x1 + i * step), board.y1, round(board.x1 + (i + 1) * step), board.y2)
+                    for i in range(columns)]
+    layout = BoardLayout(board, column_boxes)
+    layout.sampleProbes(frame)
+    return layout
+
+
+def geometryKey(width: int, height: int, dpi: int = DEFAULT_DPI) -> str:
+    """Cache key of a window geometry"""
+    return f"{width}x{height}@{dpi}"
+
+
+class BoardLayout(object):
+    def __init__(self, board: BoundingBox, columns: list, probes: list = None):
+        self.board = board
+        self.columns = columns
+        self.probes = [] if probes is None else probes
+
+    def sampleProbes(self, frame: np.ndarray, inset: int = 2, outset: int = 4) -> list:
+        """
+        Record the colour of a handful of pixels just inside and outside
+        the board edges, used to cheaply check the layout is unchanged.
+
+        :param frame: Frame the layout was found in, should be a ndarray[H, W, C] | ndarray[H, W]
+        :param inset: Distance of inner probes from the board edge, should be an int
+        :param outset: Distance of outer probes from the board edge, should be an int
+        :return: probes - list[list[int, int, list[int]]]
+        """
+        frame = _channels(frame)
+        height, width = frame.shape[:2]
+        x1, y1, x2, y2 = (int(value) for value in self.board.bounding_box)
+        points = [(x1 + inset, y1 + inset), (x2 - 1 - inset, y1 + inset),
+                  (x1 + inset, y2 - 1 - inset), (x2 - 1 - inset, y2 - 1 - inset),
+                  (x1 - outset, y1 - outset), (x2 - 1 + outset, y1 - outset),
+                  (x1 - outset, y2 - 1 + outset), (x2 - 1 + outset, y2 - 1 + outset)]
+        self.probes = [[x, y, frame[y, x].tolist()] for x, y in points if 0 <= x < width and 0 <= y < height]
+        return self.probes
+
+    def check(self, frame: np.ndarray, tolerance: int = 24) -> bool:
+        """
+        Check the probes still match the frame.
+
+        :param frame: Captured frame of the game window, should be a ndarray[H, W, C] | ndarray[H, W]
+        :param tolerance: Maximum channel difference of a probe, should be an int
+        :return: matches - bool
+        """
+        if not self.probes:
+            return False
+        frame = _channels(frame)
+        xs, ys, colours = zip(*self.probes)
+        if max(xs) >= frame.shape[1] or max(ys) >= frame.shape[0]:
+            return False
+        sampled = frame[np.asarray(ys), np.asarray(xs)].astype(np.int16)
+        return bool(np.all(np.abs(sampled - np.asarray(colours, dtype=np.int16)) <= tolerance))
+
+    def toJson(self) -> dict:
+        return {'board': self.board, 'columns': self.columns, 'probes': self.probes}
+
+    @classmethod
+    def fromJson(cls, data: dict) -> BoardLayout:
+        return cls(BoundingBox(data['board']), [BoundingBox(column) for column in data['columns']],
+                   data.get('probes'))
+
+
+class Calibrator(object):
+    def __init__(self, cache_dir: str, name: str = 'calibration.json', locate: Callable = locateBoard,
+                 tolerance: int = 24):
+        """
+        Finds the board layout once per window geometry, keeping the
+        layouts in a cache file that is validated with pixel probes.
+
+        :param cache_dir: Directory of the cache file, should be a str
+        :param name: Name of the cache file, should be a str
+        :param locate: Full frame board search, returning a BoardLayout, should be a Callable
+        :param tolerance: Maximum channel difference of a probe, should be an int
+        """
+        self.cache_dir = utils.makePath(cache_dir)
+        self.name = name
+        self.locate = locate
+        self.tolerance = tolerance
+        self.hits = 0
+        self.recalibrations = 0
+
+        cache = utils.load(self.cache_dir, self.name, errors='ignore') or {}
+        self.layouts = {key: BoardLayout.fromJson(layout) for key, layout in cache.items()}
+
+    def calibrate(self, frame: np.ndarray, dpi: int = DEFAULT_DPI, force: bool = False) -> BoardLayout | None:
+        """
+        Return the cached layout for the window geometry when its probes
+        match the frame, otherwise search the frame and update the cache.
+
+        :param frame: Captured frame of the game window, should be a ndarray[H, W, C] | ndarray[H, W]
+        :param dpi: Dots per inch of the window's display, should be an int
+        :param force: Whether to recalibrate regardless of the cache, should be a bool
+        :return: layout - BoardLayout | None
+        """
+        key = geometryKey(frame.shape[1], frame.shape[0], dpi)
+        layout = self.layouts.get(key)
+        if not force and layout is not None and layout.check(frame, tolerance=self.tolerance):
+            self.hits += 1
+            return layout
+
+        _logger.info(f"Calibrating board layout for window geometry '{key}'")
+        self.recalibrations += 1
+        layout = self.locate(frame)
+        if layout is None:
+            _logger.warning(f"Board was not found for window geometry '{key}'")
+            return None
+        self.layouts[key] = layout
+        utils.save(self.cache_dir, self.name, {key_: layout_.toJson() for key_, layout_ in self.layouts.items()})
+        return layout
+
+
+def _channels(frame: np.ndarray) -> np.ndarray:
+    """Colour channels of the frame, adding a channel axis to grayscale frames"""
+    return frame[..., np.newaxis] if frame.ndim == 2 else frame[..., :3]
+
+
+def _longestRun(flags: np.ndarray) -> tuple | None:
+    """Start and stop indices of the longest run of true values"""
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], flags.astype(np.int8), [0]))))
+    if not len(edges):
+        return None
+    starts, stops = edges[::2], edges[1::2]
+    longest = int((stops - starts).argmax())
+    return int(starts[longest]), int(stops[longest])
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import logging
+
+import numpy as np
+
+from ..solitaire import cards
+from ..utils import BoundingBox, BoundingBox2
+from .synthetic import SyntheticLayout, loadTemplates
+
+_logger = logging.getLogger(__name__)
+
+# Luma weights of the BGR channels
+GRAY_WEIGHTS = np.array([0.114, 0.587, 0.299], dtype=np.float32)
+# Maximum height in pixels of the dark border between stacked cards
+BORDER_WIDTH = 2
+
+
+def toGray(frame: np.ndarray) -> np.ndarray:
+    """
+    Convert a BGR frame to grayscale, grayscale frames are returned as is.
+
+    :param frame: Captured frame, should be a ndarray[H, W, C] | ndarray[H, W]
+    :return: gray - ndarray[H, W]
+    """
+    if frame.ndim == 2:
+        return frame
+    return frame[..., :3] @ GRAY_WEIGHTS
+
+
+def _runs(flags: np.ndarray, min_length: int = 1, max_gap: int = 0) -> list:
+    """Start and stop indices of every run of true values, joining runs separated by at most max_gap"""
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], flags.astype(np.int8), [0]))))
+    runs = []
+    for start, stop in zip(edges[::2].tolist(), edges[1::2].tolist()):
+        if runs and start - runs[-1][1] <= max_gap:
+            runs[-1] = (runs[-1][0], stop)
+        else:
+            runs.append((start, stop))
+    return [(start, stop) for start, stop in runs if stop - start >= min_length]
+
+
+class CardDetector(object):
+    def __init__(self, templates: dict, step: int, factor: int = 4, threshold: float = 128.):
+        """
+        Detects the visible area of every card and identifies it by the
+        header strip. Cards are found as bright regions of the grayscale
+        frame, split at the dark top border of each card, and labelled by
+        the template header of least squared difference.
+
+        :param templates: Card images by card id, all of the same size, should be a dict[int: ndarray[H, W, 3]]
+        :param step: Height of the header strip in pixels, should be an int
+        :param factor: Downscale factor of the coarse-to-fine path, should be an int
+        :param threshold: Minimum gray level of a card pixel, should be a float
+        """
+        if not templates:
+            raise ValueError("At least one template is required")
+        self.card_ids = np.array(list(templates), dtype=np.int32)
+        self.card_height, self.card_width = next(iter(templates.values())).shape[:2]
+        self.step = step
+        self.factor = factor
+        self.threshold = threshold
+        # Flattened headers of every template and their squared norms, for the squared differences as a product
+        self.headers = np.stack([toGray(template[:step]).ravel() for template in templates.values()]).astype(np.float32)
+        self.header_norms = (self.headers ** 2).sum(axis=1)
+
+    @classmethod
+    def fromLayout(cls, layout: SyntheticLayout, templates_dir: str = None, **kwargs) -> CardDetector:
+        """Create a detector for the card size of the layout"""
+        templates = loadTemplates(templates_dir, layout.card_width, layout.card_height, layout.step)
+        return cls(templates, layout.step, **kwargs)
+
+    def candidates(self, gray: np.ndarray, factor: int = 1) -> list:
+        """
+        Find the regions of stacked cards, each run of card columns split
+        into runs of card rows. The borders between stacked cards do not
+        split a region.
+
+        :param gray: Grayscale frame, downscaled by the factor, should be a ndarray[H, W]
+        :param factor: Downscale factor of the frame, should be an int
+        :return: regions - list[BoundingBox2]
+        """
+        mask = gray >= self.threshold
+        min_width, min_height = max(self.card_width // (2 * factor), 1), max(self.step // (2 * factor), 1)
+        max_gap = max(BORDER_WIDTH // factor, 1)
+        regions = []
+        for x1, x2 in _runs(mask.any(axis=0), min_width):
+            for y1, y2 in _runs(mask[:, x1:x2].any(axis=1), min_height, max_gap):
+                regions.append(BoundingBox2(x1, y1, x2, y2))
+        return regions
+
+    def match(self, frame: np.ndarray, region: BoundingBox2 = None) -> tuple:
+        """
+        Detect the cards within a full resolution region of the frame.
+
+        :param frame: Captured frame, should be a ndarray[H, W, C] | ndarray[H, W]
+        :param region: Region holding a single column of cards, the whole frame if None, should be a BoundingBox2
+        :return: boxes, labels - tuple[list[BoundingBox], list[str]]
+        """
+        x1, y1, x2, y2 = (0, 0, frame.shape[1], frame.shape[0]) if region is None else region.bounding_box
+        gray = toGray(frame[y1:y2, x1:x2])
+        mask = gray >= self.threshold
+        columns = np.flatnonzero(mask.any(axis=0))
+        if not len(columns):
+            return [], []
+
+        # The first bright column is inside the left border, and bright only between card borders
+        left = int(columns[0])
+        bright = np.concatenate(([False], mask[:, left]))
+        tops = np.flatnonzero(~bright[:-1] & bright[1:])
+        bottom = int(np.flatnonzero(bright)[-1]) + 1
+
+        x = x1 + left - 1
+        if x < 0 or x + self.card_width > frame.shape[1]:
+            return [], []
+        boxes, headers, stops = [], [], list(tops[1:]) + [None]
+        for top, stop in zip(tops, stops):
+            y = y1 + int(top) - 1
+            if y < 0 or y + self.step > frame.shape[0]:
+                continue
+            y_stop = y1 + int(stop) - 1 if stop is not None else min(y + self.card_height, y1 + bottom)
+            boxes.append(BoundingBox(x, y, x + self.card_width, y_stop))
+            headers.append(toGray(frame[y:y + self.step, x:x + self.card_width]).ravel())
+        if not boxes:
+            return [], []
+
+        # Squared differences less the constant norm of each header
+        errors = self.header_norms - 2 * np.stack(headers).astype(np.float32) @ self.headers.T
+        labels = [cards.cardName(int(card)) for card in self.card_ids[errors.argmin(axis=1)]]
+        return boxes, labels
+
+    def detect(self, frame: np.ndarray) -> tuple:
+        """
+        Detect the cards at full resolution.
+
+        :param frame: Captured frame, should be a ndarray[H, W, C] | ndarray[H, W]
+        :return: boxes, labels - tuple[list[BoundingBox], list[str]]
+        """
+        return self._matchAll(frame, self.candidates(toGray(frame)))
+
+    def detectCoarse(self, frame: np.ndarray) -> tuple:
+        """
+        Detect the cards coarse-to-fine, finding the candidate regions on a
+        downscaled grayscale frame and matching at full resolution only
+        within them.
+
+        :param frame: Captured frame, should be a ndarray[H, W, C] | ndarray[H, W]
+        :return: boxes, labels - tuple[list[BoundingBox], list[str]]
+        """
+        factor = self.factor
+        height, width = frame.shape[:2]
+        regions = self.candidates(toGray(frame[::factor, ::factor]), factor)
+        for region in regions:
+            region *= factor
+            # Widen by a sample to include the edges skipped by the downscaling
+            region += [-factor, -factor, factor, factor]
+            region(max(region.x1, 0), max(region.y1, 0), min(region.x2, width), min(region.y2, height))
+        return self._matchAll(frame, regions)
+
+    def _matchAll(self, frame: np.ndarray, regions: list) -> tuple:
+        boxes, labels = [], []
+        for region in regions:
+            region_boxes, region_labels = self.match(frame, region)
+            boxes += region_boxes
+            labels += region_labels
+        return boxes, labels
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+import numpy as np
+
+from ..utils import BoundingBox, box_array
+
+_logger = logging.getLogger(__name__)
+
+
+class OccupancyMask(object):
+    def __init__(self, roi: BoundingBox, dtype: type = np.int32):
+        """
+        Integer label mask of the boxes painted over a region of interest,
+        typically the board, so that hit-tests are array lookups. Boxes
+        are painted in the order they were added or last moved, later
+        boxes covering earlier ones, and 0 marks free space.
+
+        :param roi: Region of interest in screen coordinates, should be a BoundingBox
+        :param dtype: Integer type of the labels, should be a type
+        """
+        self.roi = roi
+        self.x, self.y = int(round(roi.x1)), int(round(roi.y1))
+        self.mask = np.zeros((int(round(roi.y2)) - self.y, int(round(roi.x2)) - self.x), dtype=dtype)
+
+        self._boxes = {}  # key: local (x1, y1, x2, y2), in paint order
+        self._labels = {}  # key: label
+        self._keys = [None]  # label: key
+        self._free_labels = []
+
+    def __len__(self) -> int:
+        return len(self._boxes)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._boxes
+
+    def _local(self, box: BoundingBox | list | tuple) -> tuple:
+        """Integer box clipped to the mask, relative to the region of interest"""
+        x1, y1, x2, y2 = box.bounding_box if hasattr(box, 'bounding_box') else box
+        height, width = self.mask.shape
+        return (min(max(int(round(x1)) - self.x, 0), width), min(max(int(round(y1)) - self.y, 0), height),
+                min(max(int(round(x2)) - self.x, 0), width), min(max(int(round(y2)) - self.y, 0), height))
+
+    def _paint(self, key: Any, box: tuple, within: tuple = None) -> None:
+        x1, y1, x2, y2 = box
+        if within is not None:
+            x1, y1 = max(x1, within[0]), max(y1, within[1])
+            x2, y2 = min(x2, within[2]), min(y2, within[3])
+        if x2 > x1 and y2 > y1:
+            self.mask[y1:y2, x1:x2] = self._labels[key]
+
+    def _repaint(self, region: tuple) -> None:
+        """Repaint the region from the boxes overlapping it, in paint order"""
+        x1, y1, x2, y2 = region
+        self.mask[y1:y2, x1:x2] = 0
+        if not self._boxes or x2 <= x1 or y2 <= y1:
+            return
+        keys = list(self._boxes)
+        x_overlap, y_overlap = box_array.overlaps(list(self._boxes.values()), [region])
+        for index in np.flatnonzero((x_overlap[:, 0] > 0) & (y_overlap[:, 0] > 0)).tolist():
+            self._paint(keys[index], self._boxes[keys[index]], within=region)
+
+    def add(self, key: Any, box: BoundingBox | list | tuple) -> int:
+        """
+        Paint the box on top of the mask, moving it if already painted.
+
+        :param key: Identity of the box, e.g. a track key, should be an Any
+        :param box: Box in screen coordinates, should be a BoundingBox | list | tuple
+        :return: label - int
+        """
+        if key in self._boxes:
+            return self.move(key, box)
+        label = self._free_labels.pop() if self._free_labels else len(self._keys)
+        if label == len(self._keys):
+            self._keys.append(key)
+        else:
+            self._keys[label] = key
+        self._labels[key] = label
+        self._boxes[key] = self._local(box)
+        self._paint(key, self._boxes[key])
+        return label
+
+    def move(self, key: Any, box: BoundingBox | list | tuple) -> int:
+        """
+        Move a painted box on top of the mask, only repainting the area it
+        previously covered.
+
+        :param key: Identity of the box, should be an Any
+        :param box: New box in screen coordinates, should be a BoundingBox | list | tuple
+        :return: label - int
+        """
+        old_box = self._boxes.pop(key)
+        self._repaint(old_box)
+        self._boxes[key] = self._local(box)
+        self._paint(key, self._boxes[key])
+        return self._labels[key]
+
+    def remove(self, key: Any) -> None:
+        old_box = self._boxes.pop(key)
+        label = self._labels.pop(key)
+        self._keys[label] = None
+        self._free_labels.append(label)
+        self._repaint(old_box)
+
+    def clear(self) -> None:
+        self.mask[:] = 0
+        self._boxes.clear()
+        self._labels.clear()
+        self._keys = [None]
+        self._free_labels.clear()
+
+    def hitTest(self, x: int | float, y: int | float) -> Any:
+        """
+        Find the top box under the screen coordinate.
+
+        :param x: Screen x coordinate, should be an int | float
+        :param y: Screen y coordinate, should be an int | float
+        :return: key - Any | None
+        """
+        x, y = int(x) - self.x, int(y) - self.y
+        if not (0 <= y < self.mask.shape[0] and 0 <= x < self.mask.shape[1]):
+            return None
+        return self._keys[self.mask[y, x]]
+
+    def hitTestMany(self, xs: list | tuple | np.ndarray, ys: list | tuple | np.ndarray) -> list:
+        """Find the top box under each screen coordinate"""
+        xs = np.asarray(xs, dtype=np.intp) - self.x
+        ys = np.asarray(ys, dtype=np.intp) - self.y
+        inside = (0 <= xs) & (xs < self.mask.shape[1]) & (0 <= ys) & (ys < self.mask.shape[0])
+        labels = np.zeros(len(xs), dtype=self.mask.dtype)
+        labels[inside] = self.mask[ys[inside], xs[inside]]
+        return [self._keys[label] for label in labels.tolist()]
+
+    def hitRegion(self, box: BoundingBox | list | tuple) -> set:
+        """Keys of the boxes visible within the region"""
+        x1, y1, x2, y2 = self._local(box)
+        labels = np.unique(self.mask[y1:y2, x1:x2])
+        return {self._keys[label] for label in labels.tolist() if label}
+
+    def freeMask(self, box: BoundingBox | list | tuple = None) -> np.ndarray:
+        """Mask of the free space, of the whole region of interest or within the box"""
+        x1, y1, x2, y2 = self._local(self.roi if box is None else box)
+        return self.mask[y1:y2, x1:x2] == 0
+
+    def freeArea(self, box: BoundingBox | list | tuple = None) -> int:
+        """Number of free pixels, of the whole region of interest or within the box"""
+        return int(np.count_nonzero(self.freeMask(box)))
+
+    def isFree(self, box: BoundingBox | list | tuple) -> bool:
+        """Whether no box covers any part of the region"""
+        x1, y1, x2, y2 = self._local(box)
+        return not self.mask[y1:y2, x1:x2].any()
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from ..solitaire import cards
+from ..solitaire.state import COLUMNS, GameState
+from ..utils import BoundingBox, memoize, utils
+
+_logger = logging.getLogger(__name__)
+
+# Colours are BGR, the channel order of captured frames
+WINDOW_COLOUR = (24, 20, 20)
+BOARD_COLOUR = (60, 70, 40)
+CARD_COLOUR = (220, 230, 230)
+BORDER_COLOUR = (60, 60, 60)
+FACE_COLOUR = (120, 200, 230)
+RED_COLOUR = (40, 40, 200)
+BLACK_COLOUR = (30, 30, 30)
+
+
+class SyntheticLayout(object):
+    def __init__(self, width: int = 960, height: int = 540):
+        """
+        Geometry of a synthetic board within a window of the given size.
+
+        :param width: Width of the frame in pixels, should be an int
+        :param height: Height of the frame in pixels, should be an int
+        """
+        self.width, self.height = width, height
+        self.board = BoundingBox(round(width * 0.05), round(height * 0.08), round(width * 0.95), round(height * 0.97))
+        self.column_width = self.board.width / COLUMNS
+        self.card_width = int(self.column_width * 0.8)
+        self.card_height = int(self.card_width * 1.4)
+        self.step = max(int(self.card_height * 0.18), 6)
+        self.margin = int(self.card_height * 0.1)
+        self.columns_y = int(self.board.y1 + self.margin * 2 + self.card_height)
+
+        self._background = None
+
+    @property
+    def background(self) -> np.ndarray:
+        """Frame of the empty board, rendered once"""
+        if self._background is None:
+            self._background = np.empty((self.height, self.width, 3), dtype=np.uint8)
+            self._background[:] = WINDOW_COLOUR
+            x1, y1, x2, y2 = self.board.bounding_box
+            self._background[y1:y2, x1:x2] = BOARD_COLOUR
+        return self._background
+
+    def cardX(self, column: int) -> int:
+        return int(self.board.x1 + self.column_width * column + (self.column_width - self.card_width) / 2)
+
+
+def cardTemplate(card: int, width: int, height: int, step: int) -> np.ndarray:
+    """
+    Render a card image, a bordered card whose header strip holds the
+    suit colour and a block pattern of the card id, so that the header
+    alone identifies the card when covered by other cards.
+
+    :param card: Id of the card, should be an int
+    :param width: Width of the card in pixels, should be an int
+    :param height: Height of the card in pixels, should be an int
+    :param step: Height of the header strip in pixels, should be an int
+    :return: template - ndarray[H, W, 3]
+    """
+    template = np.empty((height, width, 3), dtype=np.uint8)
+    template[:] = BORDER_COLOUR
+    template[1:-1, 1:-1] = FACE_COLOUR if cards.isFace(card) else CARD_COLOUR
+
+    colour = RED_COLOUR if cards.isRed(card) else BLACK_COLOUR
+    header = template[2:step - 1, 2:-2]
+    bits, block = 6, max((width - 4) // 8, 1)
+    header[:, :block] = colour
+    for bit in range(bits):
+        if (card >> bit) & 1:
+            header[:, block * (bit + 2):block * (bit + 3)] = colour
+    template[step + 2:height - 2, width // 4:width - width // 4] = colour
+    return template
+
+
+@memoize(max_entries=8, max_bytes=64 * 2 ** 20)
+def loadTemplates(templates_dir: str = None, width: int = None, height: int = None, step: int = None) -> dict:
+    """
+    Load card templates named by card, such as '10H.npy', rendering the
+    missing cards when the size is given. The templates are cached and
+    shared between callers, so are read-only.
+
+    :param templates_dir: Directory of the card templates, should be a str
+    :param width: Width of rendered cards in pixels, should be an int
+    :param height: Height of rendered cards in pixels, should be an int
+    :param step: Height of the header strip of rendered cards, should be an int
+    :return: templates - dict[int: ndarray[H, W, 3]]
+    """
+    templates = {}
+    if templates_dir is not None:
+        _, names = utils.listPath(templates_dir, ext='npy', errors='warn')
+        for name in names:
+            templates[cards.parseCard(utils.getLastPath(name, include_ext=False))] = \
+                np.load(utils.joinPath(templates_dir, name))
+    if width is not None:
+        for card in cards.DECK:
+            if card not in templates:
+                templates[card] = cardTemplate(card, width, height, step)
+    for template in templates.values():
+        template.flags.writeable = False
+    return templates
+
+
+def randomState(rng: random.Random, max_moves: int = 0) -> GameState:
+    """
+    Deal a shuffled deck and play up to max_moves random legal moves.
+
+    :param rng: Random number generator, should be a random.Random
+    :param max_moves: Maximum number of random moves, should be an int
+    :return: state - GameState
+    """
+    deck = list(cards.DECK)
+    rng.shuffle(deck)
+    state = GameState.deal(deck)
+    for _ in range(rng.randint(0, max_moves) if max_moves else 0):
+        moves = state.moves()
+        if not moves:
+            break
+        state = state.apply(rng.choice(moves))
+    return state
+
+
+def render(state: GameState, layout: SyntheticLayout, templates: dict, noise: int = 0,
+           rng: np.random.Generator = None) -> tuple:
+    """
+    Render the state to a frame with the ground-truth of the visible
+    area of each card.
+
+    :param state: State to be rendered, should be a GameState
+    :param layout: Geometry of the board, should be a SyntheticLayout
+    :param templates: Card images by card id, should be a dict[int: ndarray[H, W, 3]]
+    :param noise: Maximum uniform pixel noise, should be an int
+    :param rng: Random number generator of the noise, should be a numpy.random.Generator
+    :return: frame, boxes, labels - tuple[ndarray[H, W, 3], list[BoundingBox], list[str]]
+    """
+    frame = layout.background.copy()
+
+    placed = []  # card, x, y, visible height
+    if state.free_cell is not None:
+        placed.append((state.free_cell, layout.cardX(COLUMNS - 1), layout.board.y1 + layout.margin,
+                       layout.card_height))
+    for column, column_cards in enumerate(state.columns):
+        x = layout.cardX(column)
+        # Collapsed faces are shown as a single card
+        column_cards = column_cards[-1:] if state.collapsed[column] else column_cards
+        for i, card in enumerate(column_cards):
+            visible = layout.card_height if i == len(column_cards) - 1 else layout.step
+            placed.append((card, x, layout.columns_y + i * layout.step, visible))
+
+    boxes, labels = [], []
+    for card, x, y, visible in placed:
+        template = templates[card]
+        height = min(template.shape[0], layout.height - y)
+        frame[y:y + height, x:x + template.shape[1]] = template[:height]
+        boxes.append(BoundingBox(x, y, x + template.shape[1], y + min(visible, height)))
+        labels.append(cards.cardName(card))
+
+    if noise:
+        rng = np.random.default_rng() if rng is None else rng
+        jitter = rng.integers(-noise, noise + 1, size=frame.shape, dtype=np.int16)
+        frame = np.clip(frame.astype(np.int16) + jitter, 0, 255).astype(np.uint8)
+    return frame, boxes, labels
+
+
+def _generate(out_dir: str, start: int, stop: int, seed: int, size: tuple, max_moves: int, noise: int,
+              templates_dir: str = None) -> int:
+    layout = SyntheticLayout(*size)
+    templates = loadTemplates(templates_dir, layout.card_width, layout.card_height, layout.step)
+    frames_dir, deals_dir = utils.joinPath(out_dir, 'frames'), utils.joinPath(out_dir, 'deals')
+    for index in range(start, stop):
+        rng = random.Random(seed * 1000003 + index)
+        deck = list(cards.DECK)
+        rng.shuffle(deck)
+        utils.save(deals_dir, f'deal_{index:05d}.json', {'seed': seed, 'index': index, 'deck': deck})
+
+        rng.seed(seed * 1000003 + index)
+        state = randomState(rng, max_moves=max_moves)
+        frame, boxes, labels = render(state, layout, templates, noise=noise,
+                                      rng=np.random.default_rng(seed * 1000003 + index))
+        np.save(utils.joinPath(frames_dir, f'frame_{index:05d}.npy'), frame)
+        utils.save(frames_dir, f'frame_{index:05d}.json', {'boxes': boxes, 'labels': labels, 'state': state},
+                   compact=True)
+    return stop - start
+
+
+def generate(out_dir: str, count: int, seed: int = 0, size: tuple = (960, 540), max_moves: int = 10,
+             noise: int = 0, workers: int = None, templates_dir: str = None, chunk_size: int = 64) -> int:
+    """
+    Generate random deals, saved to 'deals' in the batch runner format,
+    and their frames after up to max_moves random moves, saved to 'frames'
+    with ground-truth annotations in the replay harness format. The same
+    seed always generates the same data.
+
+    :param out_dir: Directory of the generated data, should be a str
+    :param count: Number of deals and frames, should be an int
+    :param seed: Seed of the generated data, should be an int
+    :param size: Width and height of the frames, should be a tuple[int, int]
+    :param max_moves: Maximum number of random moves before rendering, should be an int
+    :param noise: Maximum uniform pixel noise, should be an int
+    :param workers: Number of worker processes, the CPU count if None, should be an int
+    :param templates_dir: Directory of card templates, rendered if None, should be a str
+    :param chunk_size: Number of frames per worker job, should be an int
+    :return: generated - int
+    """
+    utils.makePath(out_dir, 'frames')
+    utils.makePath(out_dir, 'deals')
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_generate, out_dir, i, min(i + chunk_size, count), seed, tuple(size), max_moves,
+                               noise, templates_dir) for i in range(0, count, chunk_size)]
+        generated = sum(future.result() for future in futures)
+    _logger.info(f"Generated {generated} deals and frames in {time.perf_counter() - start:.1f}s")
+    return generated
+
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(prog='synthetic', description="Generate synthetic deals and frames")
+    parser.add_argument('out_dir', help="directory of the generated data")
+    parser.add_argument('--count', type=int, default=1000, help="number of deals and frames")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the generated data")
+    parser.add_argument('--size', type=int, nargs=2, default=(960, 540), metavar=('WIDTH', 'HEIGHT'))
+    parser.add_argument('--max-moves', type=int, default=10, help="maximum random moves before rendering")
+    parser.add_argument('--noise', type=int, default=0, help="maximum uniform pixel noise")
+    parser.add_argument('--workers', type=int, help="number of worker processes")
+    parser.add_argument('--templates', help="directory of card templates")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    generated = generate(args.out_dir, args.count, seed=args.seed, size=args.size, max_moves=args.max_moves,
+                         noise=args.noise, workers=args.workers, templates_dir=args.templates)
+    elapsed = time.perf_counter() - start
+    print(f"Generated {generated} deals and frames in {elapsed:.1f}s ({generated / elapsed:.0f} frames/s)")
+    return generated
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import collections
+import logging
+from typing import Any, Callable
+
+import numpy as np
+
+from ..utils import BoundingBox, box_array, getKey
+
+_logger = logging.getLogger(__name__)
+
+
+class Track(object):
+    def __init__(self, key: str, box: BoundingBox, label: Any = None, confidence: float = 0.):
+        self.key = key
+        self.box = box
+        self.label = label
+        self.confidence = confidence
+        self.age = 0
+        self.missed = 0
+
+    def __repr__(self) -> str:
+        return f"Track({self.key}, {self.box}, {self.label!r}, {self.confidence:.2f})"
+
+
+class CardTracker(object):
+    def __init__(self, classify: Callable, match_threshold: float = 0.5, moved_threshold: float = 0.9,
+                 decay: float = 0.98, min_confidence: float = 0.6, max_missed: int = 2, history: int = 1000):
+        """
+        Associates card detections across frames so that only new, moved or
+        uncertain cards are sent to the classifier, the remaining cards
+        carry their label forward with a decaying confidence.
+
+        :param classify: Classifies a list of boxes, returning a (label, confidence) for each, should be a
+         Callable[[list[BoundingBox]], list[tuple[Any, float]]]
+        :param match_threshold: Minimum decimal area overlap to associate a detection, should be a float
+        :param moved_threshold: Minimum intersection over union to consider a card still, should be a float
+        :param decay: Confidence multiplier per frame a label is carried forward, should be a float
+        :param min_confidence: Confidence below which a card is classified again, should be a float
+        :param max_missed: Frames a track survives without a detection, should be an int
+        :param history: Number of latest frames whose classifier calls are kept, should be an int
+        """
+        self.classify = classify
+        self.match_threshold = match_threshold
+        self.moved_threshold = moved_threshold
+        self.decay = decay
+        self.min_confidence = min_confidence
+        self.max_missed = max_missed
+
+        self.tracks = {}
+        self.classifier_calls = collections.deque(maxlen=history)
+        self.total_classifier_calls = 0
+        self.frames = 0
+
+    @property
+    def last_classifier_calls(self) -> int:
+        """Number of boxes classified for the latest frame"""
+        return self.classifier_calls[-1] if self.classifier_calls else 0
+
+    def associate(self, tracks: list, boxes: list) -> tuple:
+        """
+        Greedily pair tracks and detections by largest decimal area overlap.
+
+        :param tracks: Existing tracks, should be a list[Track]
+        :param boxes: Detected bounding boxes, should be a list[BoundingBox]
+        :return: pairs, ious - tuple[list[tuple[int, int]], ndarray[N, M]]
+        """
+        if not tracks or not boxes:
+            return [], np.zeros((len(tracks), len(boxes)))
+        track_boxes = box_array.toArray([track.box for track in tracks])
+        detected = box_array.toArray(boxes)
+        overlap = box_array.decimalOverlap(track_boxes, detected)[0]
+        ious = box_array.iou(track_boxes, detected)
+
+        rows, cols = np.nonzero(overlap >= self.match_threshold)
+        order = np.lexsort((-ious[rows, cols], -overlap[rows, cols]))
+        pairs, used_tracks, used_boxes = [], set(), set()
+        for i, j in zip(rows[order].tolist(), cols[order].tolist()):
+            if i not in used_tracks and j not in used_boxes:
+                used_tracks.add(i)
+                used_boxes.add(j)
+                pairs.append((i, j))
+        return pairs, ious
+
+    def update(self, boxes: list) -> list:
+        """
+        Update the tracks with the detections of a new frame.
+
+        :param boxes: Detected bounding boxes, should be a list[BoundingBox]
+        :return: tracks - list[Track], in the order of the given boxes
+        """
+        tracks = list(self.tracks.values())
+        pairs, ious = self.associate(tracks, boxes)
+
+        matched = [None] * len(boxes)
+        to_classify = []
+        for i, j in pairs:
+            track = tracks[i]
+            track.box = boxes[j]
+            track.age += 1
+            track.missed = 0
+            track.confidence *= self.decay
+            matched[j] = track
+            if ious[i, j] < self.moved_threshold or track.confidence < self.min_confidence:
+                to_classify.append(track)
+
+        for j, box in enumerate(boxes):
+            if matched[j] is None:
+                track = Track(getKey(self.tracks), box)
+                self.tracks[track.key] = track
+                matched[j] = track
+                to_classify.append(track)
+
+        if to_classify:
+            for track, (label, confidence) in zip(to_classify, self.classify([track.box for track in to_classify])):
+                track.label, track.confidence = label, confidence
+        self.classifier_calls.append(len(to_classify))
+        self.total_classifier_calls += len(to_classify)
+        self.frames += 1
+
+        seen = {track.key for track in matched}
+        for track in tracks:
+            if track.key not in seen:
+                track.missed += 1
+                if track.missed > self.max_missed:
+                    del self.tracks[track.key]
+        _logger.debug(f"Tracking {len(self.tracks)} cards, classified {len(to_classify)} of {len(boxes)}")
+        return matched
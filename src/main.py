@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import argparse
+import logging
+
+from exapunks_bots.solitaire import batch
+
+
+def main(argv: list = None) -> None:
+    parser = argparse.ArgumentParser(prog='exapunks-bots', description="Exapunks-Bots: Applied CV and AI to play "
+                                                                       "Exapunks minigames")
+    parser.add_argument('--log-level', default='INFO', help="logging level")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    batch_parser = commands.add_parser('batch', help="solve a directory of recorded or synthetic deals")
+    batch_parser.add_argument('deals_dir', help="directory of '.json' or '.exb' deal files")
+    batch_parser.add_argument('--results', default='results.jsonl', help="append-only results file")
+    batch_parser.add_argument('--workers', type=int, help="number of worker processes")
+    batch_parser.add_argument('--time-limit', type=float, default=10., help="maximum seconds per deal")
+    batch_parser.add_argument('--max-nodes', type=int, default=200000, help="maximum searched states per deal")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=args.log_level.upper())
+
+    if args.command == 'batch':
+        summary = batch.runBatch(args.deals_dir, args.results, workers=args.workers, time_limit=args.time_limit,
+                                 max_nodes=args.max_nodes)
+        latency = summary['latency']
+        print(f"Solved {summary['solved']} of {summary['deals']} deals ({summary['win_rate']:.1%}), "
+              f"{summary['errors']} errors")
+        print(f"Throughput: {summary['throughput']:.2f} deals/s over {summary['elapsed']:.1f}s")
+        print(f"Latency: p50 {latency['p50']:.3f}s, p90 {latency['p90']:.3f}s, p99 {latency['p99']:.3f}s, "
+              f"max {latency['max']:.3f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,186 @@
+import pickle
+
+import pytest
+
+from exapunks_bots.utils import BoundingBox, BoundingBox2, Point
+
+
+def primed(*values):
+    """Box whose derived geometry has been cached"""
+    box = BoundingBox(*values)
+    assert (box.width, box.height, box.area, box.centre_pos, box.pos1, box.pos2) is not None
+    assert box.polygon
+    return box
+
+
+def assertGeometry(box, x1, y1, x2, y2):
+    assert box.bounding_box == [x1, y1, x2, y2]
+    assert box.pos1 == (x1, y1) and box.pos2 == (x2, y2)
+    assert box.width == x2 - x1 and box.height == y2 - y1
+    assert box.area == (x2 - x1) * (y2 - y1)
+    assert box.centre_pos == (x2 - (x2 - x1) / 2, y2 - (y2 - y1) / 2)
+    assert box.polygon == [(x1, y1), (x2, y1), (x2, y2), (x1, y2)]
+
+
+def testConstruct():
+    assertGeometry(BoundingBox(0, 0, 10, 20), 0, 0, 10, 20)
+    assertGeometry(BoundingBox((1, 2), (3, 4)), 1, 2, 3, 4)
+    assertGeometry(BoundingBox([1, 2, 3, 4]), 1, 2, 3, 4)
+    with pytest.raises(ValueError):
+        BoundingBox(1, 2, 3)
+
+
+def testCall():
+    box = primed(0, 0, 10, 20)
+    assert box(1, 1, 5, 5) is box
+    assertGeometry(box, 1, 1, 5, 5)
+    box((0, 0), (2, 2))
+    assertGeometry(box, 0, 0, 2, 2)
+
+
+@pytest.mark.parametrize('op, values, expected', [
+    ('__iadd__', 1, [1, 1, 11, 21]),
+    ('__iadd__', [1, 2], [1, 2, 11, 22]),
+    ('__isub__', [1, 2, 3, 4], [-1, -2, 7, 16]),
+    ('__imul__', 2, [0, 0, 20, 40]),
+    ('__ifloordiv__', 3, [0, 0, 3, 6]),
+    ('__itruediv__', 4, [0., 0., 2.5, 5.]),
+])
+def testInPlaceOperators(op, values, expected):
+    box = primed(0, 0, 10, 20)
+    assert getattr(box, op)(values) is box
+    assertGeometry(box, *expected)
+
+
+@pytest.mark.parametrize('op, values, expected', [
+    ('__add__', [1, 2], [1, 2, 11, 22]),
+    ('__sub__', 1, [-1, -1, 9, 19]),
+    ('__mul__', [1, 2, 3, 4], [0, 0, 30, 80]),
+    ('__floordiv__', 3, [0, 0, 3, 6]),
+    ('__truediv__', 2, [0., 0., 5., 10.]),
+])
+def testBinaryOperatorsDoNotMutate(op, values, expected):
+    box = primed(0, 0, 10, 20)
+    assert getattr(box, op)(values) == expected
+    assertGeometry(box, 0, 0, 10, 20)
+
+
+def testOperatorErrors():
+    box = BoundingBox(0, 0, 1, 1)
+    with pytest.raises(ValueError):
+        box + [1, 2, 3]
+    with pytest.raises(TypeError):
+        box + 'a'
+
+
+def testMerge():
+    box = primed(2, 2, 4, 4)
+    box.merge(BoundingBox(0, 3, 3, 5), BoundingBox(3, 1, 6, 3))
+    assertGeometry(box, 0, 1, 6, 5)
+    box.merge([BoundingBox(-1, -1, 0, 0)])
+    assertGeometry(box, -1, -1, 6, 5)
+
+
+def testMergeEmpty():
+    box = BoundingBox()
+    box.merge()
+    box.merge([])
+    assert box.bounding_box == []
+    box.merge(BoundingBox(1, 2, 3, 4))
+    assertGeometry(box, 1, 2, 3, 4)
+
+    box = primed(1, 2, 3, 4)
+    box.merge([])
+    assertGeometry(box, 1, 2, 3, 4)
+
+
+def testMergeDoesNotShareCoordinates():
+    other = BoundingBox(1, 2, 3, 4)
+    box = BoundingBox()
+    box.merge(other)
+    box += 1
+    assertGeometry(other, 1, 2, 3, 4)
+
+
+@pytest.mark.parametrize('attr, index', [('x1', 0), ('y1', 1), ('x2', 2), ('y2', 3)])
+def testSetters(attr, index):
+    box = primed(0, 0, 10, 20)
+    setattr(box, attr, 5)
+    expected = [0, 0, 10, 20]
+    expected[index] = 5
+    assertGeometry(box, *expected)
+    with pytest.raises(TypeError):
+        setattr(box, attr, '5')
+
+
+def testStretch():
+    box = primed(10, 10, 20, 30)
+    box.stretchVertically(0.5)
+    assertGeometry(box, 10, 0., 20, 40.)
+    box.stretchHorizontally(0.5)
+    assertGeometry(box, 5., 0., 25., 40.)
+    box.stretchHorizontallyAbsolute(5)
+    assertGeometry(box, 0., 0., 30., 40.)
+    box.stretchVerticallyAbsolute(10)
+    assertGeometry(box, 0., -10., 30., 50.)
+
+
+def testOffset():
+    box = primed(0, 0, 10, 20)
+    box.offset_x(2)
+    assertGeometry(box, 2, 0, 12, 20)
+    box.offset_x(1, 3)
+    assertGeometry(box, 3, 0, 15, 20)
+    box.offset_y(2)
+    assertGeometry(box, 3, 2, 15, 22)
+    box.offset_y(1, 3)
+    assertGeometry(box, 3, 3, 15, 25)
+
+
+def testRoundAndInt():
+    box = primed(0.26, 1.74, 10.5, 20.25)
+    round(box, 1)
+    assertGeometry(box, 0.3, 1.7, 10.5, 20.2)
+    box.__int__()
+    assertGeometry(box, 0, 1, 10, 20)
+
+
+def testEquality():
+    assert BoundingBox(0, 0, 1, 1) == BoundingBox((0, 0), (1, 1))
+    assert BoundingBox(0, 0, 1, 1) != BoundingBox(0, 0, 1, 2)
+    assert BoundingBox(0, 0, 1, 1) != BoundingBox2(0, 0, 1, 1)
+    assert hash(BoundingBox(0, 0, 1, 1)) == hash(BoundingBox(0, 0, 1, 1))
+
+
+def testBoundingBoxReturnsCopy():
+    box = BoundingBox(0, 0, 1, 1)
+    box.bounding_box[0] = 5
+    box.polygon[0] = None
+    assertGeometry(box, 0, 0, 1, 1)
+
+
+def testBoundingBox2():
+    box = BoundingBox2(0, 0, 4, 4)
+    assert box.area == 16
+    box *= 2
+    assert box.area == 64
+    assert box.overlapArea(BoundingBox2(4, 4, 10, 10)) == 16
+
+
+def testPickle():
+    box = primed(1, 2, 5, 7)
+    loaded = pickle.loads(pickle.dumps(box))
+    assert loaded == box
+    loaded += 1
+    assertGeometry(loaded, 2, 3, 6, 8)
+
+
+@pytest.mark.parametrize('cls', [BoundingBox, BoundingBox2])
+def testLegacyPickle(cls):
+    # Boxes used to store their corners as a list of points
+    legacy = cls.__new__(cls)
+    legacy.__dict__['_bounding_box'] = [Point(1, 2), Point(5, 7)]
+    box = pickle.loads(pickle.dumps(legacy))
+    assertGeometry(box, 1, 2, 5, 7)
+    box += 1
+    assertGeometry(box, 2, 3, 6, 8)
@@ -0,0 +1,32 @@
+import os
+
+from exapunks_bots.utils import Cache, memoize, utils
+
+
+def testKeywordArgumentsDoNotCollide():
+    @memoize()
+    def identity(*args, **kwargs):
+        return args, kwargs
+
+    assert identity('a', k='v') == (('a',), {'k': 'v'})
+    assert identity(('a',), (('k', 'v'),)) == ((('a',), (('k', 'v'),)), {})
+    assert identity('a', k='v') == (('a',), {'k': 'v'})
+
+
+def testKeywordKeysPersist(tmp_path):
+    @memoize()
+    def identity(*args, **kwargs):
+        return args, kwargs
+
+    identity('a', k='v')
+    for ext in ('.pkl', '.exb'):
+        path = os.path.join(str(tmp_path), 'cache' + ext)
+        assert identity.cache.save(path)
+        cache = Cache(path=path)
+        assert cache.load() == 1
+        assert [cache.get(key) for key in identity.cache._entries] == [(('a',), {'k': 'v'})]
+
+
+def testPathHelpersAcceptUnhashableArguments():
+    assert utils.joinPath('a', ['b']) == 'a'
+    assert utils.joinPath('a', 'b', ext='txt') == utils.joinPath('a', 'b', ext='.txt')
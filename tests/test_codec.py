@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from exapunks_bots.utils import BoundingBox, BoundingBox2, Point, codec
+
+
+def plain(value):
+    """Comparable form of decoded values, keeping container and number types"""
+    if isinstance(value, Point):
+        return 'Point', tuple(map(plain, value.pos))
+    if isinstance(value, (BoundingBox, BoundingBox2)):
+        return type(value).__name__, tuple(map(plain, value.bounding_box))
+    if isinstance(value, (list, tuple)):
+        return type(value)(map(plain, value))
+    if isinstance(value, dict):
+        return {plain(key): plain(item) for key, item in value.items()}
+    return type(value).__name__, value
+
+
+VALUES = [
+    None, True, False, 0, -1, 2 ** 63, -2 ** 70, 1.5, float('inf'), '', 'café', b'\x00\xff', bytearray(b'ab'),
+    [], (), [1, 'a', None], (1, (2, [3])), {'a': 1, 2: [3.5], (1, 2): None},
+    Point(1, 2), Point(1.5, -2), BoundingBox(1, 2, 3, 4), BoundingBox2(0.5, 1, 2, 3),
+    [Point(1, 2), Point(3, 4)], (Point(1, 2), Point(3, 4)), {'a': (Point(1, 2), Point(3, 4))},
+    [BoundingBox(1, 2, 3, 4), BoundingBox(0.5, 1.5, 2.5, 3.5)], (BoundingBox(1, 2, 3, 4.5),),
+    [BoundingBox(1, 2, 3, 4), BoundingBox2(1, 2, 3, 4)],
+]
+
+
+@pytest.mark.parametrize('value', VALUES, ids=range(len(VALUES)))
+def testRoundTrip(value):
+    decoded = codec.loads(codec.dumps(value))
+    if isinstance(value, bytearray):
+        assert decoded == bytes(value)
+    else:
+        assert plain(decoded) == plain(value)
+
+
+def testMixedCoordinateTypes():
+    boxes = codec.loads(codec.dumps([BoundingBox(1, 2, 3, 4), BoundingBox(1.5, 2, 3, 4)]))
+    assert [type(value) for value in boxes[0].bounding_box] == [int] * 4
+    assert [type(value) for value in boxes[1].bounding_box] == [float, int, int, int]
+
+
+def testNumpy():
+    array = np.arange(12, dtype=np.float32).reshape(3, 4)
+    decoded = codec.loads(codec.dumps({'array': array, 'f': np.float64(1.5), 'i': np.int64(1), 'b': np.bool_(True),
+                                       'box': BoundingBox(*np.arange(4))}))
+    assert decoded['array'].dtype == array.dtype and (decoded['array'] == array).all()
+    assert plain([decoded['f'], decoded['i'], decoded['b']]) == plain([1.5, 1, True])
+    assert plain(decoded['box']) == plain(BoundingBox(0, 1, 2, 3))
+    with pytest.raises(TypeError):
+        codec.dumps(np.array([object()]))
+
+
+def testRegisteredType():
+    class Frame(object):
+        def __init__(self, index):
+            self.index = index
+
+    codec.register('test.frame', Frame, lambda frame: frame.index, Frame)
+    assert codec.loads(codec.dumps([Frame(3)]))[0].index == 3
+    with pytest.raises(ValueError):
+        codec.register('test.frame', dict, dict, dict)
+
+
+def testUnsupportedType():
+    with pytest.raises(TypeError):
+        codec.dumps({1, 2})
+
+
+def testTruncated():
+    data = codec.dumps({'a': [Point(1, 2), Point(3, 4)], 'b': 'text', 'c': np.zeros(3), 'd': (1.5, None)})
+    for size in range(len(data)):
+        with pytest.raises(ValueError):
+            codec.loads(data[:size])
+
+
+def testCorrupt():
+    data = codec.dumps([1, 2])
+    with pytest.raises(ValueError):
+        codec.loads(b'PKL\x00' + data[4:])
+    with pytest.raises(ValueError):
+        codec.loads(data + b'\x00')
+    with pytest.raises(ValueError):
+        codec.loads(codec._HEADER.pack(codec.MAGIC, codec.VERSION + 1) + data[6:])
+    with pytest.raises(ValueError):
+        codec.loads(data[:6] + bytes((255,)) + data[7:])
+    with pytest.raises(ValueError):
+        codec.loads(codec.dumps(Point(1, 2)).replace(b'q', b'x'))
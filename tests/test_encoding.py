@@ -0,0 +1,31 @@
+import math
+
+import pytest
+
+from exapunks_bots.utils import BoundingBox, Point, encoding
+
+
+@pytest.fixture(params=['orjson', 'json'])
+def backend(request, monkeypatch):
+    if request.param == 'json':
+        monkeypatch.setattr(encoding, 'orjson', None)
+    elif encoding.orjson is None:
+        pytest.skip("orjson is not installed")
+    return request.param
+
+
+def testRoundTrip(backend):
+    data = {'name': 'café', 'null': 'null', 'f': 1e-7, 'g': 1e16, 1: 'one',
+            'boxes': [BoundingBox(1, 2, 3, 4), BoundingBox(5, 6, 7.5, 8)], 'point': Point(1, 2)}
+    encoded = encoding.dumps(data)
+    assert '"café"' in encoded and '"1":"one"' in encoded
+    decoded = encoding.loads(encoded)
+    assert decoded['boxes'] == data['boxes'] and decoded['point'].pos == (1, 2)
+    assert {key: decoded[key] for key in ('name', 'null', 'f', 'g', '1')} == \
+        {'name': 'café', 'null': 'null', 'f': 1e-7, 'g': 1e16, '1': 'one'}
+
+
+def testNonFiniteFloats(backend):
+    decoded = encoding.loads(encoding.dumps({'values': [float('nan'), float('inf')], 'none': None}))
+    assert math.isnan(decoded['values'][0]) and decoded['values'][1] == math.inf
+    assert decoded['none'] is None
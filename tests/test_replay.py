@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from exapunks_bots.benchmark.replay import ReplayHarness, ReplayResult
+from exapunks_bots.utils import BoundingBox, utils
+
+BOXES = [BoundingBox(0, 0, 10, 10), BoundingBox(20, 20, 30, 30)]
+
+
+@pytest.fixture
+def frames_dir(tmp_path):
+    frames_dir = str(tmp_path)
+    np.save(utils.joinPath(frames_dir, 'a.npy'), np.zeros((4, 4), dtype=np.uint8))
+    utils.save(frames_dir, 'b.exb', np.ones((4, 4), dtype=np.uint8))
+    utils.save(frames_dir, 'c.pkl', np.ones((4, 4), dtype=np.uint8))
+    for name in 'abc':
+        utils.save(frames_dir, f'{name}.json', {'boxes': [box.bounding_box for box in BOXES], 'labels': [1, 2]})
+    return frames_dir
+
+
+@pytest.mark.parametrize('detections, label_matches', [
+    (list(BOXES), 0),
+    (tuple(BOXES), 0),
+    (np.array([box.bounding_box for box in BOXES]), 0),
+    ((list(BOXES), [1, 2]), 2),
+    ((np.array([box.bounding_box for box in BOXES]), [1, 3]), 1),
+])
+def testScore(frames_dir, detections, label_matches):
+    harness = ReplayHarness(frames_dir, {'detect': lambda frame: detections})
+    result = harness.run()
+    assert harness.frame_names == ['a.npy', 'b.exb', 'c.pkl']
+    assert result.frames == result.annotated_frames == 3
+    assert result.precision == result.recall == 1.
+    assert result.label_matches == label_matches * 3
+
+
+def testScoreMissedDetections(frames_dir):
+    result = ReplayResult(['detect'])
+    harness = ReplayHarness(frames_dir, {'detect': lambda frame: None})
+    harness.score(result, None, BOXES)
+    harness.score(result, (BOXES[0],), BOXES)
+    assert (result.true_positives, result.false_positives, result.false_negatives) == (1, 0, 3)
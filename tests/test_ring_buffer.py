@@ -0,0 +1,43 @@
+import multiprocessing
+
+import numpy as np
+import pytest
+
+from exapunks_bots.pipeline import FrameRingBuffer
+
+
+def readAndClose(buffer, slot, sequence, results):
+    with buffer.frame(slot, sequence) as frame:
+        results.put(int(frame.sum()))
+    buffer.close()
+
+
+@pytest.mark.parametrize('method', ['fork', 'spawn'])
+def testWorkerCloseKeepsSharedMemory(method):
+    if method not in multiprocessing.get_all_start_methods():
+        pytest.skip(f"'{method}' start method is not available")
+    context = multiprocessing.get_context(method)
+    buffer = FrameRingBuffer(2, (4, 4), lock=context.Lock())
+    try:
+        slot, sequence = buffer.write(np.ones((4, 4), dtype=np.uint8))
+        results = context.Queue()
+        process = context.Process(target=readAndClose, args=(buffer, slot, sequence, results))
+        process.start()
+        assert results.get(timeout=30) == 16
+        process.join(timeout=30)
+        assert process.exitcode == 0
+
+        # The worker closing its buffer must not unlink the block of the creating process
+        with FrameRingBuffer(2, (4, 4), name=buffer.name, lock=buffer.lock, create=False) as attached:
+            with attached.frame(slot, sequence) as frame:
+                assert frame.sum() == 16
+    finally:
+        buffer.close()
+
+
+def testOverwrittenSlot():
+    with FrameRingBuffer(1, (2,)) as buffer:
+        slot, sequence = buffer.write(np.zeros(2, dtype=np.uint8))
+        assert buffer.latest() == (slot, sequence)
+        buffer.write(np.ones(2, dtype=np.uint8))
+        assert buffer.acquire(slot, sequence) is None
@@ -0,0 +1,78 @@
+import time
+
+import pytest
+
+from exapunks_bots.capture import MockWindowBackend, Supervisor
+from exapunks_bots.utils import BoundingBox
+
+ROIS = [BoundingBox(0, 0, 40, 30), BoundingBox(40, 0, 80, 30), BoundingBox(0, 30, 40, 60)]
+
+
+def waitFor(condition, timeout: float = 5.) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError("Condition was not met in time")
+        time.sleep(0.005)
+
+
+@pytest.mark.parametrize('serial_input', [True, False])
+def testInputSerializedAcrossWindows(serial_input):
+    backend = MockWindowBackend(ROIS, serial_input=serial_input, input_delay=0.02)
+    with Supervisor(backend, detect=lambda frame: frame.shape) as supervisor:
+        supervisor.start()
+        for i in range(4):
+            for window in backend.windows:
+                supervisor.sendInput(window.handle, ('click', i, i))
+        waitFor(lambda: len(backend.inputs) == 4 * len(ROIS))
+
+    # Each window keeps the order of its own input
+    for window in backend.windows:
+        assert [action for handle, action, _ in backend.inputs if handle == window.handle] == \
+            [('click', i, i) for i in range(4)]
+    if serial_input:
+        assert backend.max_concurrent_inputs == 1
+    else:
+        assert backend.max_concurrent_inputs > 1
+
+
+def testCpuBudgetSplitBetweenWindows():
+    backend = MockWindowBackend(ROIS)
+    with Supervisor(backend, detect=lambda frame: frame.shape, cpu_budget=0.6) as supervisor:
+        instances = supervisor.discover()
+        assert len(instances) == 3
+        assert [instance.scheduler.cpu_budget for instance in instances] == pytest.approx([0.2] * 3)
+
+        backend.closeWindow(0)
+        instances = supervisor.discover()
+        assert [instance.scheduler.cpu_budget for instance in instances] == pytest.approx([0.3] * 2)
+
+        supervisor.start()
+        waitFor(lambda: all(instance.detections for instance in instances))
+        assert all(instance.detection == (30, 40, 3) for instance in instances)
+
+
+def testClosedWindowCleanup():
+    backend = MockWindowBackend(ROIS)
+    detected = set()
+    with Supervisor(backend, detect=lambda frame: frame.shape,
+                    on_detect=lambda instance, _: detected.add(instance.window.handle)) as supervisor:
+        supervisor.start()
+        waitFor(lambda: detected == {0, 1, 2})
+        closed = supervisor.instances[1]
+
+        backend.closeWindow(1)
+        supervisor.discover()
+        assert sorted(supervisor.instances) == [0, 2]
+        assert sorted(supervisor.stats) == [0, 2]
+        assert not closed._input_thread.is_alive()
+        with pytest.raises(RuntimeError):
+            closed._executor.submit(print)
+
+        # The remaining windows are still captured
+        frames = {handle: instance.frames for handle, instance in supervisor.instances.items()}
+        waitFor(lambda: all(instance.frames > frames[handle] for handle, instance in supervisor.instances.items()))
+        instances = list(supervisor.instances.values())
+
+    assert supervisor.instances == {}
+    assert not any(instance._input_thread.is_alive() for instance in instances)